@@ -0,0 +1,18 @@
+"""ASGI entrypoint for EAMP FastAPI server.
+
+Applies ``fastapi-deferred-init`` (when installed) before the application is
+imported, so route values are computed on first use instead of being
+recalculated for every router at startup.
+"""
+
+try:
+    from fastapi_deferred_init import apply_patch
+except ImportError:  # Optional dependency (``pip install .[fast-startup]``)
+    pass
+else:
+    # Must run before anything imports fastapi.routing
+    apply_patch()
+
+from app.main import app, main  # noqa: E402
+
+__all__ = ["app", "main"]
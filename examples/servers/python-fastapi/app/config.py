@@ -1,10 +1,15 @@
 """Configuration management for EAMP FastAPI server."""
 
 import os
-from typing import List, Optional
+from functools import cached_property
+from typing import Any, Optional, Tuple
 
-from pydantic import BaseModel, Field
-from pydantic_settings import BaseSettings
+from pydantic import BaseModel, Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode
+from typing_extensions import Annotated
+
+# Comma-separated list read from the environment, split once at load time
+CSVTuple = Annotated[Tuple[str, ...], NoDecode]
 
 
 class ServerConfig(BaseModel):
@@ -27,23 +32,23 @@ class SecurityConfig(BaseModel):
     secret_key: str = Field(default="change-me-in-production")
     access_token_expire_minutes: int = Field(default=30)
     api_key_header: Optional[str] = Field(default="X-API-Key")
-    valid_api_keys: List[str] = Field(default_factory=list)
+    valid_api_keys: Tuple[str, ...] = Field(default=())
 
 
 class CORSConfig(BaseModel):
     """CORS configuration."""
-    allowed_origins: List[str] = Field(
-        default_factory=lambda: [
+    allowed_origins: Tuple[str, ...] = Field(
+        default=(
             "http://localhost:3000",
             "http://localhost:3001",
             "http://localhost:5173",
-        ]
+        )
     )
-    allowed_methods: List[str] = Field(
-        default_factory=lambda: ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+    allowed_methods: Tuple[str, ...] = Field(
+        default=("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
     )
-    allowed_headers: List[str] = Field(
-        default_factory=lambda: ["Content-Type", "Authorization", "Accept", "X-API-Key"]
+    allowed_headers: Tuple[str, ...] = Field(
+        default=("Content-Type", "Authorization", "Accept", "X-API-Key")
     )
 
 
@@ -57,6 +62,7 @@ class RateLimitConfig(BaseModel):
     """Rate limiting configuration."""
     requests_per_minute: int = Field(default=60)
     burst: int = Field(default=10)
+    max_tracked_ips: int = Field(default=100_000, gt=0)
 
 
 class WebSocketConfig(BaseModel):
@@ -109,20 +115,23 @@ class Settings(BaseSettings):
         default="X-API-Key", 
         env="API_KEY_HEADER"
     )
-    valid_api_keys_str: str = Field(default="", env="VALID_API_KEYS")
+    valid_api_keys: CSVTuple = Field(default=(), env="VALID_API_KEYS")
     
     # CORS
-    allowed_origins_str: str = Field(
+    allowed_origins: CSVTuple = Field(
         default="http://localhost:3000,http://localhost:3001,http://localhost:5173",
-        env="ALLOWED_ORIGINS"
+        env="ALLOWED_ORIGINS",
+        validate_default=True,
     )
-    allowed_methods_str: str = Field(
+    allowed_methods: CSVTuple = Field(
         default="GET,POST,PUT,PATCH,DELETE,OPTIONS",
-        env="ALLOWED_METHODS"
+        env="ALLOWED_METHODS",
+        validate_default=True,
     )
-    allowed_headers_str: str = Field(
+    allowed_headers: CSVTuple = Field(
         default="Content-Type,Authorization,Accept,X-API-Key",
-        env="ALLOWED_HEADERS"
+        env="ALLOWED_HEADERS",
+        validate_default=True,
     )
     
     # Cache
@@ -135,6 +144,10 @@ class Settings(BaseSettings):
         env="RATE_LIMIT_REQUESTS_PER_MINUTE"
     )
     rate_limit_burst: int = Field(default=10, env="RATE_LIMIT_BURST")
+    rate_limit_max_tracked_ips: int = Field(
+        default=100_000, 
+        env="RATE_LIMIT_MAX_TRACKED_IPS"
+    )
     
     # WebSocket
     ws_max_connections: int = Field(default=100, env="WS_MAX_CONNECTIONS")
@@ -158,7 +171,21 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
     
-    @property
+    @field_validator(
+        "valid_api_keys", "allowed_origins", "allowed_methods", "allowed_headers",
+        mode="before",
+    )
+    @classmethod
+    def _split_csv(cls, value: Any) -> Any:
+        """Split comma-separated values into a tuple of stripped items."""
+        if isinstance(value, str):
+            return tuple(item.strip() for item in value.split(",") if item.strip())
+        return value
+    
+    # Sub-configs are built once on first access and reused; ``settings`` is a
+    # process-wide singleton, so they never need to be rebuilt.
+    
+    @cached_property
     def server(self) -> ServerConfig:
         """Get server configuration."""
         return ServerConfig(
@@ -170,40 +197,31 @@ class Settings(BaseSettings):
             workers=self.workers,
         )
     
-    @property
+    @cached_property
     def database(self) -> DatabaseConfig:
         """Get database configuration."""
         return DatabaseConfig(url=self.database_url)
     
-    @property
+    @cached_property
     def security(self) -> SecurityConfig:
         """Get security configuration."""
-        valid_keys = (
-            [key.strip() for key in self.valid_api_keys_str.split(",") if key.strip()]
-            if self.valid_api_keys_str
-            else []
-        )
         return SecurityConfig(
             secret_key=self.secret_key,
             access_token_expire_minutes=self.access_token_expire_minutes,
             api_key_header=self.api_key_header,
-            valid_api_keys=valid_keys,
+            valid_api_keys=self.valid_api_keys,
         )
     
-    @property
+    @cached_property
     def cors(self) -> CORSConfig:
         """Get CORS configuration."""
-        origins = [o.strip() for o in self.allowed_origins_str.split(",") if o.strip()]
-        methods = [m.strip() for m in self.allowed_methods_str.split(",") if m.strip()]
-        headers = [h.strip() for h in self.allowed_headers_str.split(",") if h.strip()]
-        
         return CORSConfig(
-            allowed_origins=origins,
-            allowed_methods=methods,
-            allowed_headers=headers,
+            allowed_origins=self.allowed_origins,
+            allowed_methods=self.allowed_methods,
+            allowed_headers=self.allowed_headers,
         )
     
-    @property
+    @cached_property
     def cache(self) -> CacheConfig:
         """Get cache configuration."""
         return CacheConfig(
@@ -211,15 +229,16 @@ class Settings(BaseSettings):
             max_size=self.cache_max_size,
         )
     
-    @property
+    @cached_property
     def rate_limit(self) -> RateLimitConfig:
         """Get rate limit configuration."""
         return RateLimitConfig(
             requests_per_minute=self.rate_limit_requests_per_minute,
             burst=self.rate_limit_burst,
+            max_tracked_ips=self.rate_limit_max_tracked_ips,
         )
     
-    @property
+    @cached_property
     def websocket(self) -> WebSocketConfig:
         """Get WebSocket configuration."""
         return WebSocketConfig(
@@ -227,7 +246,7 @@ class Settings(BaseSettings):
             heartbeat_interval_seconds=self.ws_heartbeat_interval_seconds,
         )
     
-    @property
+    @cached_property
     def monitoring(self) -> MonitoringConfig:
         """Get monitoring configuration."""
         return MonitoringConfig(
@@ -235,7 +254,7 @@ class Settings(BaseSettings):
             metrics_endpoint=self.metrics_endpoint,
         )
     
-    @property
+    @cached_property
     def logging(self) -> LoggingConfig:
         """Get logging configuration."""
         return LoggingConfig(
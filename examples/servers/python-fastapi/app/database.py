@@ -1,17 +1,88 @@
 """Database configuration and models for EAMP FastAPI server."""
 
-import json
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
 
 import aiosqlite
-from pydantic import ValidationError
+import orjson
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_jsonable_python
 
 from app.config import settings
 from eamp.models import EAMPMetadata
 
 
+# Columns stored as JSON text
+JSON_FIELDS = frozenset({
+    "data_points", "visual_elements", "accessibility_features",
+    "tags", "context", "scenes",
+})
+
+# Columns that update_metadata may modify
+UPDATABLE_FIELDS = frozenset({
+    "type", "eamp_version", "short_alt", "extended_description",
+    "transcript",
+}) | JSON_FIELDS
+
+# Columns of the metadata table, in INSERT order
+METADATA_COLUMNS = (
+    "id", "type", "eamp_version", "short_alt", "extended_description",
+    "data_points", "visual_elements", "accessibility_features",
+    "tags", "context", "transcript", "scenes", "created_at", "updated_at",
+)
+
+INSERT_METADATA_SQL = """
+    INSERT INTO metadata (
+        id, type, eamp_version, short_alt, extended_description,
+        data_points, visual_elements, accessibility_features,
+        tags, context, transcript, scenes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@lru_cache(maxsize=64)
+def _build_list_query(has_type: bool, num_tags: int, keyset: bool) -> str:
+    """Build the list_metadata SQL for a given filter shape.
+    
+    Parameters are bound in order: type, tags, then either the keyset cursor
+    (updated_at, updated_at, id) and limit, or limit and offset.
+    """
+    query = "SELECT * FROM metadata WHERE 1=1"
+    
+    if has_type:
+        query += " AND type = ?"
+    
+    if num_tags:
+        # Match records carrying any of the given tags
+        placeholders = ", ".join("?" * num_tags)
+        query += (
+            " AND id IN (SELECT metadata_id FROM metadata_tags"
+            f" WHERE tag IN ({placeholders}))"
+        )
+    
+    if keyset:
+        query += " AND (updated_at < ? OR (updated_at = ? AND id < ?))"
+        query += " ORDER BY updated_at DESC, id DESC LIMIT ?"
+    else:
+        query += " ORDER BY updated_at DESC, id DESC LIMIT ? OFFSET ?"
+    
+    return query
+
+
+def _utc_timestamp() -> str:
+    """Get the current UTC time as an ISO 8601 string for timestamp columns."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value for a JSON TEXT column."""
+    # Pydantic models nested in plain dicts/lists are converted on demand
+    return orjson.dumps(value, default=to_jsonable_python).decode()
+
+
 class DatabaseManager:
     """Database manager for EAMP metadata."""
     
@@ -28,10 +99,37 @@ class DatabaseManager:
         
         # Ensure data directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        
+        # One long-lived connection shared by all operations; the lock keeps
+        # concurrent writers from interleaving statements and commits
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+    
+    @property
+    def conn(self) -> aiosqlite.Connection:
+        """Get the open database connection."""
+        if self._conn is None:
+            raise RuntimeError("Database not initialized; call initialize() first")
+        return self._conn
     
     async def initialize(self) -> None:
         """Initialize the database with required tables."""
-        async with aiosqlite.connect(self.db_path) as db:
+        if self._conn is None:
+            self._conn = await aiosqlite.connect(self.db_path)
+            self._conn.row_factory = aiosqlite.Row
+        
+        db = self._conn
+        # WAL lets readers proceed alongside a writer and needs only
+        # synchronous=NORMAL for durability; mmap and a 20 MB page cache keep
+        # hot pages out of read() syscalls
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA mmap_size=268435456")
+        await db.execute("PRAGMA temp_store=MEMORY")
+        await db.execute("PRAGMA cache_size=-20000")
+        await db.execute("PRAGMA busy_timeout=5000")
+        
+        async with self._lock:
             await db.execute(
                 """
                 CREATE TABLE IF NOT EXISTS metadata (
@@ -60,203 +158,315 @@ class DatabaseManager:
             await db.execute(
                 "CREATE INDEX IF NOT EXISTS idx_metadata_updated_at ON metadata(updated_at)"
             )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_metadata_type_updated_at "
+                "ON metadata(type, updated_at DESC, id DESC)"
+            )
             
-            await db.commit()
-    
-    async def create_metadata(self, metadata: EAMPMetadata) -> Dict[str, Any]:
-        """Create new metadata record."""
-        async with aiosqlite.connect(self.db_path) as db:
-            now = datetime.utcnow().isoformat()
+            # Normalized tag index so tag filters are exact, indexed lookups
+            async with db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'metadata_tags'"
+            ) as cursor:
+                has_tag_table = await cursor.fetchone() is not None
             
             await db.execute(
                 """
-                INSERT INTO metadata (
-                    id, type, eamp_version, short_alt, extended_description,
-                    data_points, visual_elements, accessibility_features,
-                    tags, context, transcript, scenes, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    metadata.id,
-                    metadata.type,
-                    metadata.eamp_version,
-                    metadata.short_alt,
-                    metadata.extended_description,
-                    json.dumps([dp.model_dump() for dp in metadata.data_points]) if metadata.data_points else None,
-                    json.dumps([ve.model_dump() for ve in metadata.visual_elements]) if metadata.visual_elements else None,
-                    json.dumps(metadata.accessibility_features) if metadata.accessibility_features else None,
-                    json.dumps(metadata.tags) if metadata.tags else None,
-                    json.dumps(metadata.context.model_dump()) if metadata.context else None,
-                    metadata.transcript,
-                    json.dumps([s.model_dump() for s in metadata.scenes]) if metadata.scenes else None,
-                    now,
-                    now,
-                ),
+                CREATE TABLE IF NOT EXISTS metadata_tags (
+                    metadata_id TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (metadata_id, tag)
+                )
+                """
+            )
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_metadata_tags_tag ON metadata_tags(tag)"
             )
+            
+            if not has_tag_table:
+                # Backfill from databases created before the tag table existed
+                await db.execute(
+                    """
+                    INSERT OR IGNORE INTO metadata_tags (metadata_id, tag)
+                    SELECT metadata.id, json_each.value
+                    FROM metadata, json_each(metadata.tags)
+                    WHERE metadata.tags IS NOT NULL
+                    """
+                )
+            
             await db.commit()
+    
+    async def create_metadata(self, metadata: EAMPMetadata) -> Dict[str, Any]:
+        """Create new metadata record."""
+        db = self.conn
+        async with self._lock:
+            now = _utc_timestamp()
+            
+            record = self._metadata_record(metadata, now)
             
-            # Return the created record with timestamps
-            return await self.get_metadata(metadata.id)
+            try:
+                await db.execute(INSERT_METADATA_SQL, self._record_to_row(record))
+                await self._write_tags(db, metadata.id, metadata.tags)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        
+        # The stored row is exactly what was just written, so return it
+        # without reading it back
+        return record
+    
+    async def bulk_create_metadata(self, items: List[EAMPMetadata]) -> int:
+        """Create many metadata records in a single transaction.
+        
+        Returns the number of records inserted.
+        """
+        if not items:
+            return 0
+        
+        db = self.conn
+        async with self._lock:
+            now = _utc_timestamp()
+            
+            try:
+                await db.executemany(
+                    INSERT_METADATA_SQL,
+                    [
+                        self._record_to_row(self._metadata_record(metadata, now))
+                        for metadata in items
+                    ],
+                )
+                await db.executemany(
+                    "INSERT OR IGNORE INTO metadata_tags (metadata_id, tag) VALUES (?, ?)",
+                    [
+                        (metadata.id, tag)
+                        for metadata in items
+                        for tag in metadata.tags or ()
+                    ],
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        
+        return len(items)
     
     async def get_metadata(self, resource_id: str) -> Optional[Dict[str, Any]]:
         """Get metadata by resource ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(
-                "SELECT * FROM metadata WHERE id = ?", (resource_id,)
-            )
+        async with self.conn.execute(
+            "SELECT * FROM metadata WHERE id = ?", (resource_id,)
+        ) as cursor:
             row = await cursor.fetchone()
-            
-            if not row:
-                return None
-            
-            return self._row_to_dict(row)
+        
+        if not row:
+            return None
+        
+        return self._row_to_dict(row)
     
     async def list_metadata(
         self, 
         type_filter: Optional[str] = None,
         tags: Optional[List[str]] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """List metadata with optional filtering."""
-        query = "SELECT * FROM metadata WHERE 1=1"
-        params = []
+        """List metadata with optional filtering.
+        
+        Pass ``cursor`` (from ``make_cursor`` on the last row of the previous
+        page) to page by key instead of ``offset``, which avoids scanning and
+        discarding every skipped row on deep pages.
+        """
+        params: List[Any] = []
         
         if type_filter:
-            query += " AND type = ?"
             params.append(type_filter)
         
         if tags:
-            # Simple tag filtering - check if any tag is in the JSON array
-            tag_conditions = []
-            for tag in tags:
-                tag_conditions.append("JSON_EXTRACT(tags, '$') LIKE ?")
-                params.append(f"%{tag}%")
-            
-            if tag_conditions:
-                query += f" AND ({' OR '.join(tag_conditions)})"
+            params.extend(tags)
         
-        query += " ORDER BY updated_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        if cursor:
+            updated_at, _, last_id = cursor.partition("|")
+            params.extend([updated_at, updated_at, last_id, limit])
+        else:
+            params.extend([limit, offset])
         
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute(query, params)
-            rows = await cursor.fetchall()
-            
-            return [self._row_to_dict(row) for row in rows]
+        query = _build_list_query(bool(type_filter), len(tags or ()), bool(cursor))
+        
+        async with self.conn.execute(query, params) as db_cursor:
+            rows = await db_cursor.fetchall()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    @staticmethod
+    def make_cursor(record: Dict[str, Any]) -> str:
+        """Build the ``list_metadata`` cursor that continues after a record."""
+        return f"{record['updated_at']}|{record['id']}"
     
     async def update_metadata(
-        self, resource_id: str, updates: Dict[str, Any]
+        self, resource_id: str, updates: Union[Dict[str, Any], BaseModel]
     ) -> Optional[Dict[str, Any]]:
-        """Update existing metadata record."""
-        # First check if record exists
-        existing = await self.get_metadata(resource_id)
-        if not existing:
-            return None
+        """Update existing metadata record.
+        
+        ``updates`` may be a dict of field values or a Pydantic model, in
+        which case only the fields that were explicitly set are applied.
+        """
+        if isinstance(updates, BaseModel):
+            updates = updates.model_dump(mode="json", exclude_unset=True)
         
         # Build update query dynamically
         set_clauses = []
         params = []
         
-        allowed_fields = {
-            "type", "eamp_version", "short_alt", "extended_description",
-            "data_points", "visual_elements", "accessibility_features",
-            "tags", "context", "transcript", "scenes"
-        }
-        
         for field, value in updates.items():
-            if field not in allowed_fields:
+            if field not in UPDATABLE_FIELDS:
                 continue
             
             set_clauses.append(f"{field} = ?")
             
             # Handle JSON fields
-            if field in {"data_points", "visual_elements", "scenes"}:
-                if value is not None:
-                    # Assuming value is already a list of model instances or dicts
-                    if hasattr(value[0], 'model_dump') if value else False:
-                        params.append(json.dumps([item.model_dump() for item in value]))
-                    else:
-                        params.append(json.dumps(value))
-                else:
-                    params.append(None)
-            elif field in {"accessibility_features", "tags"}:
-                params.append(json.dumps(value) if value else None)
-            elif field == "context" and value is not None:
-                if hasattr(value, 'model_dump'):
-                    params.append(json.dumps(value.model_dump()))
-                else:
-                    params.append(json.dumps(value))
+            if field in JSON_FIELDS:
+                params.append(_dumps(value) if value else None)
             else:
                 params.append(value)
         
         if not set_clauses:
-            return existing
+            return await self.get_metadata(resource_id)
         
         # Add updated_at
+        now = _utc_timestamp()
         set_clauses.append("updated_at = ?")
-        params.append(datetime.utcnow().isoformat())
+        params.append(now)
         params.append(resource_id)
         
         query = f"UPDATE metadata SET {', '.join(set_clauses)} WHERE id = ?"
         
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(query, params)
-            await db.commit()
+        db = self.conn
+        # The read and the write share the lock so a concurrent delete can't
+        # land in between
+        async with self._lock:
+            existing = await self.get_metadata(resource_id)
+            if not existing:
+                return None
+            
+            try:
+                cursor = await db.execute(query, params)
+                if cursor.rowcount == 0:
+                    await db.rollback()
+                    return None
+                if "tags" in updates:
+                    await self._write_tags(db, resource_id, updates["tags"], replace=True)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        
+        # Apply the same changes to the record already in hand rather than
+        # reading it back
+        for field, value in updates.items():
+            if field in JSON_FIELDS:
+                existing[field] = to_jsonable_python(value) if value else None
+            elif field in UPDATABLE_FIELDS:
+                existing[field] = to_jsonable_python(value)
+        existing["updated_at"] = now
         
-        return await self.get_metadata(resource_id)
+        return existing
     
     async def delete_metadata(self, resource_id: str) -> bool:
         """Delete metadata record."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "DELETE FROM metadata WHERE id = ?", (resource_id,)
-            )
-            await db.commit()
+        db = self.conn
+        async with self._lock:
+            try:
+                cursor = await db.execute(
+                    "DELETE FROM metadata WHERE id = ?", (resource_id,)
+                )
+                await db.execute(
+                    "DELETE FROM metadata_tags WHERE metadata_id = ?", (resource_id,)
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
             return cursor.rowcount > 0
     
     async def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Total count
-            cursor = await db.execute("SELECT COUNT(*) FROM metadata")
+        db = self.conn
+        
+        # Total count
+        async with db.execute("SELECT COUNT(*) FROM metadata") as cursor:
             total_count = (await cursor.fetchone())[0]
-            
-            # Count by type
-            cursor = await db.execute(
-                "SELECT type, COUNT(*) FROM metadata GROUP BY type"
-            )
+        
+        # Count by type
+        async with db.execute(
+            "SELECT type, COUNT(*) FROM metadata GROUP BY type"
+        ) as cursor:
             type_counts = {row[0]: row[1] for row in await cursor.fetchall()}
-            
-            return {
-                "total_count": total_count,
-                "by_type": type_counts,
-            }
+        
+        return {
+            "total_count": total_count,
+            "by_type": type_counts,
+        }
+    
+    def _metadata_record(self, metadata: EAMPMetadata, now: str) -> Dict[str, Any]:
+        """Build the record dict (as returned by get_metadata) for new metadata."""
+        # One traversal of the model tree for every column
+        record = metadata.model_dump(mode="json", include=set(METADATA_COLUMNS))
+        
+        # Empty JSON values are stored as NULL
+        for field in JSON_FIELDS:
+            if not record[field]:
+                record[field] = None
+        
+        record["created_at"] = now
+        record["updated_at"] = now
+        return {column: record[column] for column in METADATA_COLUMNS}
+    
+    def _record_to_row(self, record: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Build the INSERT parameters for a record dict."""
+        return tuple(
+            _dumps(record[column])
+            if column in JSON_FIELDS and record[column] is not None
+            else record[column]
+            for column in METADATA_COLUMNS
+        )
+    
+    async def _write_tags(
+        self,
+        db: aiosqlite.Connection,
+        resource_id: str,
+        tags: Optional[List[str]],
+        replace: bool = False,
+    ) -> None:
+        """Write tag index rows for a record (caller commits)."""
+        if replace:
+            await db.execute(
+                "DELETE FROM metadata_tags WHERE metadata_id = ?", (resource_id,)
+            )
+        if tags:
+            await db.executemany(
+                "INSERT OR IGNORE INTO metadata_tags (metadata_id, tag) VALUES (?, ?)",
+                [(resource_id, tag) for tag in tags],
+            )
     
     def _row_to_dict(self, row: aiosqlite.Row) -> Dict[str, Any]:
         """Convert database row to dictionary."""
         result = dict(row)
         
         # Parse JSON fields
-        json_fields = {
-            "data_points", "visual_elements", "accessibility_features",
-            "tags", "context", "scenes"
-        }
-        
-        for field in json_fields:
+        for field in JSON_FIELDS:
             if result.get(field):
                 try:
-                    result[field] = json.loads(result[field])
-                except json.JSONDecodeError:
+                    result[field] = orjson.loads(result[field])
+                except orjson.JSONDecodeError:
                     result[field] = None
         
         return result
     
     async def close(self) -> None:
-        """Close database connections. (No-op for aiosqlite)"""
-        pass
+        """Close the database connection."""
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
 
 
 # Global database instance
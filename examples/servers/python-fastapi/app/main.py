@@ -5,7 +5,6 @@ import sys
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
@@ -15,13 +14,12 @@ from app import __version__
 from app.config import settings
 from app.database import db
 from app.middleware.auth import AuthMiddleware
+from app.middleware.bypass import BypassMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.routes.health import router as health_router
 from app.routes.info import router as info_router
 from app.routes.metadata import router as metadata_router
-from app.routes.metrics import router as metrics_router
 from app.utils.logging_config import setup_logging
-from app.utils.sample_data import initialize_sample_data
 
 # Set up logging
 setup_logging()
@@ -39,6 +37,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     # Load sample data in development
     if settings.environment == "development":
+        # Only needed in development, so only imported there
+        from app.utils.sample_data import initialize_sample_data
+        
         logger.info("Loading sample data...")
         await initialize_sample_data(db)
     
@@ -62,13 +63,30 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Health checks and metrics scraping are served by a bare application that
+# sits in front of the middleware stack below
+probe_app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+probe_app.include_router(health_router, tags=["Health"])
+probe_paths = ["/health"]
+
+if settings.monitoring.enable_metrics:
+    from app.routes.metrics import router as metrics_router
+    
+    probe_app.include_router(
+        metrics_router, 
+        prefix=settings.monitoring.metrics_endpoint, 
+        tags=["Metrics"]
+    )
+    probe_paths.append(settings.monitoring.metrics_endpoint)
+
 # Add CORS middleware
+cors = settings.cors
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors.allowed_origins,
+    allow_origins=cors.allowed_origins,
     allow_credentials=True,
-    allow_methods=settings.cors.allowed_methods,
-    allow_headers=settings.cors.allowed_headers,
+    allow_methods=cors.allowed_methods,
+    allow_headers=cors.allowed_headers,
     expose_headers=["X-Total-Count", "ETag", "Cache-Control"],
 )
 
@@ -82,19 +100,14 @@ if settings.security.valid_api_keys:
 # Add rate limiting middleware
 app.add_middleware(RateLimitMiddleware)
 
+# Route probe endpoints around all of the middleware above (added last, so
+# it runs first)
+app.add_middleware(BypassMiddleware, bypass_app=probe_app, prefixes=probe_paths)
+
 # Include routers
-app.include_router(health_router, tags=["Health"])
 app.include_router(info_router, tags=["Info"])
 app.include_router(metadata_router, prefix="/metadata", tags=["Metadata"])
 
-# Include metrics router if enabled
-if settings.monitoring.enable_metrics:
-    app.include_router(
-        metrics_router, 
-        prefix=settings.monitoring.metrics_endpoint, 
-        tags=["Metrics"]
-    )
-
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -129,8 +142,12 @@ async def global_exception_handler(request, exc: Exception):
 
 def main() -> None:
     """Run the server."""
+    # Deferred so importing the app (e.g. under another ASGI server or in
+    # tests) does not load uvicorn
+    import uvicorn
+    
     uvicorn.run(
-        "app.main:app",
+        "app.asgi:app",
         host=settings.host,
         port=settings.port,
         reload=settings.reload and settings.environment == "development",
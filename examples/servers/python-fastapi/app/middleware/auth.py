@@ -1,70 +1,89 @@
 """Authentication middleware for EAMP FastAPI server."""
 
-from typing import Callable
-
-from fastapi import Request, Response, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
+from fastapi import status
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import settings
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Middleware for API key authentication."""
+class AuthMiddleware:
+    """ASGI middleware for API key authentication."""
     
-    def __init__(self, app, **kwargs):
-        super().__init__(app, **kwargs)
-        self.api_key_header = settings.security.api_key_header
-        self.valid_keys = set(settings.security.valid_api_keys)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        security = settings.security
+        self.api_key_header = security.api_key_header or "X-API-Key"
+        self.valid_keys = frozenset(security.valid_api_keys)
+        
+        # With no API keys configured every request is allowed
+        self._auth_disabled = not self.valid_keys
         
-        # Paths that don't require authentication
-        self.public_paths = {
-            "/health",
+        # ASGI header names are lowercased bytes
+        self._api_key_header = self.api_key_header.lower().encode("latin-1")
+        
+        # Paths that don't require authentication (/health and metrics are
+        # routed around this middleware by BypassMiddleware in app.main)
+        self.public_paths = frozenset({
             "/info",
             "/docs",
             "/redoc",
             "/openapi.json",
-        }
+        })
         
         # Allow GET requests to metadata in development
         self.allow_dev_get = settings.environment == "development"
+        
+        # The rejection response never changes, so encode it once
+        self._401_body = orjson.dumps({
+            "error": {
+                "code": "AUTHENTICATION_ERROR",
+                "message": "Valid API key required",
+            }
+        })
+        self._401_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self._401_body)).encode("latin-1")),
+        ]
     
-    async def dispatch(
-        self, request: Request, call_next: Callable
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request."""
-        # Skip authentication for public paths
-        if request.url.path in self.public_paths:
-            return await call_next(request)
+        # Pass straight through when no keys are configured, and for
+        # non-HTTP scopes (WebSocket connections, lifespan events)
+        if self._auth_disabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        path = scope["path"]
         
-        # Skip authentication for WebSocket upgrade requests
-        if request.headers.get("upgrade") == "websocket":
-            return await call_next(request)
+        # Skip authentication for public paths
+        if path in self.public_paths:
+            await self.app(scope, receive, send)
+            return
         
         # Allow GET requests in development
         if (
             self.allow_dev_get 
-            and request.method == "GET" 
-            and request.url.path.startswith("/metadata")
+            and scope["method"] == "GET" 
+            and path.startswith("/metadata")
         ):
-            return await call_next(request)
-        
-        # Check API key for protected routes
-        if not self.valid_keys:
-            # No API keys configured, allow all requests
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
         
         # Get API key from header
-        api_key = request.headers.get(self.api_key_header or "X-API-Key")
+        api_key = None
+        for name, value in scope["headers"]:
+            if name == self._api_key_header:
+                api_key = value.decode("latin-1")
+                break
         
         if not api_key or api_key not in self.valid_keys:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={
-                    "error": {
-                        "code": "AUTHENTICATION_ERROR",
-                        "message": "Valid API key required",
-                    }
-                },
-            )
+            await send({
+                "type": "http.response.start",
+                "status": status.HTTP_401_UNAUTHORIZED,
+                "headers": self._401_headers,
+            })
+            await send({"type": "http.response.body", "body": self._401_body})
+            return
         
-        return await call_next(request)
\ No newline at end of file
+        await self.app(scope, receive, send)
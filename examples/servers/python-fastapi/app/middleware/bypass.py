@@ -0,0 +1,31 @@
+"""Middleware-bypass dispatch for EAMP FastAPI server."""
+
+from typing import Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class BypassMiddleware:
+    """ASGI middleware that hands selected paths to a separate application.
+    
+    Starlette wraps mounted sub-applications in the full middleware stack, so
+    mounting alone does not save any work. Added as the outermost middleware,
+    this sends matching HTTP requests straight to ``bypass_app`` and skips
+    every middleware registered before it.
+    """
+    
+    def __init__(self, app: ASGIApp, bypass_app: ASGIApp, prefixes: Iterable[str]):
+        self.app = app
+        self.bypass_app = bypass_app
+        self.exact_paths = frozenset(prefixes)
+        self.prefixes = tuple(f"{prefix.rstrip('/')}/" for prefix in self.exact_paths)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Dispatch the request."""
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path in self.exact_paths or path.startswith(self.prefixes):
+                await self.bypass_app(scope, receive, send)
+                return
+        
+        await self.app(scope, receive, send)
@@ -1,111 +1,166 @@
 """Rate limiting middleware for EAMP FastAPI server."""
 
 import time
-from collections import defaultdict, deque
-from typing import Callable, DefaultDict, Deque
+from collections import OrderedDict
+from typing import List, Tuple
 
-from fastapi import Request, Response, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
+from fastapi import status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware for rate limiting requests."""
+class RateLimitMiddleware:
+    """ASGI middleware for rate limiting requests.
     
-    def __init__(self, app, **kwargs):
-        super().__init__(app, **kwargs)
-        self.requests_per_minute = settings.rate_limit.requests_per_minute
-        self.burst_limit = settings.rate_limit.burst
+    Counters are kept for at most ``max_tracked_ips`` clients; beyond that the
+    least recently seen client is forgotten, so memory stays bounded no matter
+    how many distinct (possibly spoofed) addresses send requests.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        rate_limit = settings.rate_limit
+        self.requests_per_minute = rate_limit.requests_per_minute
+        self.burst_limit = rate_limit.burst
+        self.max_tracked_ips = rate_limit.max_tracked_ips
         self.window_size = 60  # 60 seconds
         
-        # Store request timestamps by IP
-        self.requests: DefaultDict[str, Deque[float]] = defaultdict(deque)
+        # Header values that never change, encoded once
+        self._limit_bytes = str(self.requests_per_minute).encode("latin-1")
+        self._retry_after_bytes = str(self.window_size).encode("latin-1")
+        
+        # X-RateLimit-Remaining can only take values 0..requests_per_minute
+        self._remaining_table = [
+            str(remaining).encode("latin-1")
+            for remaining in range(self.requests_per_minute + 1)
+        ]
+        
+        # X-RateLimit-Reset is the end of the current window, so it only
+        # needs recomputing when the window rolls over
+        self._reset_window = -1
+        self._reset_bytes = b"0"
         
-        # Paths to skip rate limiting
-        self.skip_paths = {
-            "/health",
-            settings.monitoring.metrics_endpoint,
-        }
+        # The rejection body and all but the reset header never change,
+        # so encode them once
+        self._429_body = orjson.dumps({
+            "error": {
+                "code": "RATE_LIMIT_EXCEEDED",
+                "message": "Too many requests, please try again later",
+            }
+        })
+        self._429_headers: List[Tuple[bytes, bytes]] = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self._429_body)).encode("latin-1")),
+            (b"retry-after", self._retry_after_bytes),
+            (b"x-ratelimit-limit", self._limit_bytes),
+            (b"x-ratelimit-remaining", b"0"),
+        ]
+        
+        # Fixed-window counters by IP: (window index, request count),
+        # kept in LRU order so the least recently seen IP is evicted first
+        self.buckets: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
     
-    async def dispatch(
-        self, request: Request, call_next: Callable
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request with rate limiting."""
-        # Skip rate limiting for certain paths
-        if request.url.path in self.skip_paths:
-            return await call_next(request)
-        
-        # Skip for WebSocket upgrades
-        if request.headers.get("upgrade") == "websocket":
-            return await call_next(request)
+        # Only plain HTTP requests are limited; WebSocket connections and
+        # lifespan events pass straight through. Health checks and metrics
+        # never get here: BypassMiddleware in app.main routes them around it
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
         # Get client IP
-        client_ip = self._get_client_ip(request)
-        current_time = time.time()
+        client_ip = self._get_client_ip(scope)
         
-        # Clean old requests outside the window
-        self._clean_old_requests(client_ip, current_time)
+        # Monotonic time is immune to wall-clock jumps; the wall clock is
+        # only used to express the reset time to clients
+        now = time.monotonic()
+        window = int(now // self.window_size)
+        if window != self._reset_window:
+            reset_in = self.window_size - (now % self.window_size)
+            self._reset_bytes = str(int(time.time() + reset_in)).encode("latin-1")
+            self._reset_window = window
+        reset_bytes = self._reset_bytes
         
         # Check if rate limit exceeded
-        request_count = len(self.requests[client_ip])
+        request_count = self._get_count(client_ip, window)
         
         if request_count >= self.requests_per_minute:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "error": {
-                        "code": "RATE_LIMIT_EXCEEDED",
-                        "message": "Too many requests, please try again later",
-                    }
-                },
-                headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(current_time + 60)),
-                },
-            )
+            # Keep a client that is being limited from aging out of the LRU;
+            # with a limit of 0 the client never gets a bucket
+            if client_ip in self.buckets:
+                self.buckets.move_to_end(client_ip)
+            await send({
+                "type": "http.response.start",
+                "status": status.HTTP_429_TOO_MANY_REQUESTS,
+                "headers": [
+                    *self._429_headers,
+                    (b"x-ratelimit-reset", reset_bytes),
+                ],
+            })
+            await send({"type": "http.response.body", "body": self._429_body})
+            return
         
         # Record this request
-        self.requests[client_ip].append(current_time)
+        request_count += 1
+        self._set_count(client_ip, window, request_count)
         
-        # Process the request
-        response = await call_next(request)
+        rate_limit_headers = (
+            (b"x-ratelimit-limit", self._limit_bytes),
+            (b"x-ratelimit-remaining", self._remaining_table[
+                self.requests_per_minute - request_count
+            ]),
+            (b"x-ratelimit-reset", reset_bytes),
+        )
         
-        # Add rate limit headers
-        remaining = max(0, self.requests_per_minute - len(self.requests[client_ip]))
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(current_time + 60))
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            # Add rate limit headers
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *rate_limit_headers]
+            await send(message)
         
-        return response
+        # Process the request
+        await self.app(scope, receive, send_with_rate_limit_headers)
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope) -> str:
         """Extract client IP address."""
+        # Scan the raw headers once; the first occurrence of each name wins
+        forwarded_for = real_ip = None
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                if forwarded_for is None:
+                    forwarded_for = value
+            elif name == b"x-real-ip":
+                if real_ip is None:
+                    real_ip = value
+        
         # Check for forwarded IP (if behind a proxy)
-        forwarded_for = request.headers.get("X-Forwarded-For")
         if forwarded_for:
             # Take the first IP if multiple are present
-            return forwarded_for.split(",")[0].strip()
+            return forwarded_for.decode("latin-1").split(",")[0].strip()
         
         # Check for real IP header
-        real_ip = request.headers.get("X-Real-IP")
         if real_ip:
-            return real_ip
+            return real_ip.decode("latin-1")
         
         # Fall back to client host
-        return request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
-    def _clean_old_requests(self, client_ip: str, current_time: float) -> None:
-        """Remove requests older than the window size."""
-        request_times = self.requests[client_ip]
-        cutoff_time = current_time - self.window_size
-        
-        # Remove old requests
-        while request_times and request_times[0] < cutoff_time:
-            request_times.popleft()
-        
-        # Clean up empty deques
-        if not request_times:
-            del self.requests[client_ip]
\ No newline at end of file
+    def _get_count(self, client_ip: str, window: int) -> int:
+        """Get the request count for a client in the current window."""
+        bucket = self.buckets.get(client_ip)
+        if bucket is None or bucket[0] != window:
+            return 0
+        return bucket[1]
+    
+    def _set_count(self, client_ip: str, window: int, count: int) -> None:
+        """Store the request count for a client, evicting the oldest IP if full."""
+        buckets = self.buckets
+        buckets[client_ip] = (window, count)
+        buckets.move_to_end(client_ip)
+        
+        if len(buckets) > self.max_tracked_ips:
+            buckets.popitem(last=False)
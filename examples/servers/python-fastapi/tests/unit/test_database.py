@@ -0,0 +1,248 @@
+"""Unit tests for the EAMP server database layer."""
+
+import asyncio
+import sqlite3
+
+import pytest
+import pytest_asyncio
+from eamp.models import EAMPMetadata
+
+from app.database import DatabaseManager
+
+
+def make_metadata(resource_id, content_type="image", tags=None):
+    """Create a metadata record for tests."""
+    return EAMPMetadata(
+        id=resource_id,
+        type=content_type,
+        short_alt=f"Alt text for {resource_id}",
+        extended_description=f"Description of {resource_id}.",
+        tags=tags,
+    )
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    """An initialized database in a temporary directory."""
+    manager = DatabaseManager(str(tmp_path / "eamp.db"))
+    await manager.initialize()
+    yield manager
+    await manager.close()
+
+
+class TestMetadataRecords:
+    """Test creating, reading, updating and deleting records."""
+
+    @pytest.mark.asyncio
+    async def test_create_and_get(self, database):
+        """Test a created record can be read back."""
+        created = await database.create_metadata(
+            make_metadata("chart-1", tags=["finance", "charts"])
+        )
+        stored = await database.get_metadata("chart-1")
+
+        assert stored["id"] == "chart-1"
+        assert stored["short_alt"] == "Alt text for chart-1"
+        assert stored["tags"] == ["finance", "charts"]
+        assert stored["updated_at"] == created["updated_at"]
+
+    @pytest.mark.asyncio
+    async def test_get_missing(self, database):
+        """Test reading a missing record returns None."""
+        assert await database.get_metadata("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_duplicate_create_rolls_back(self, database):
+        """Test a failed create leaves no open transaction behind."""
+        await database.create_metadata(make_metadata("chart-1"))
+
+        with pytest.raises(sqlite3.IntegrityError):
+            await database.create_metadata(make_metadata("chart-1"))
+
+        assert not database.conn.in_transaction
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_rolls_back(self, database):
+        """Test a failing bulk insert stores nothing."""
+        await database.create_metadata(make_metadata("chart-1"))
+
+        with pytest.raises(sqlite3.IntegrityError):
+            await database.bulk_create_metadata([
+                make_metadata("chart-2"),
+                make_metadata("chart-1"),
+            ])
+
+        assert await database.get_metadata("chart-2") is None
+        assert not database.conn.in_transaction
+
+    @pytest.mark.asyncio
+    async def test_update(self, database):
+        """Test updates change fields, tags and the update timestamp."""
+        created = await database.create_metadata(make_metadata("chart-1", tags=["old"]))
+
+        updated = await database.update_metadata(
+            "chart-1", {"short_alt": "New alt text", "tags": ["new"]}
+        )
+        stored = await database.get_metadata("chart-1")
+
+        assert updated["short_alt"] == stored["short_alt"] == "New alt text"
+        assert updated["tags"] == stored["tags"] == ["new"]
+        assert stored["updated_at"] > created["updated_at"]
+        tagged = await database.list_metadata(tags=["new"])
+        assert [record["id"] for record in tagged] == ["chart-1"]
+        assert await database.list_metadata(tags=["old"]) == []
+
+    @pytest.mark.asyncio
+    async def test_update_missing(self, database):
+        """Test updating a missing record returns None."""
+        assert await database.update_metadata("missing", {"short_alt": "x"}) is None
+
+    @pytest.mark.asyncio
+    async def test_update_after_concurrent_delete(self, database, monkeypatch):
+        """Test an update of a row deleted before the write returns None."""
+        await database.create_metadata(make_metadata("chart-1"))
+        get_metadata = database.get_metadata
+
+        async def get_then_delete(resource_id):
+            # Stand-in for a writer that removes the row after it was read
+            record = await get_metadata(resource_id)
+            await database.conn.execute(
+                "DELETE FROM metadata WHERE id = ?", (resource_id,)
+            )
+            await database.conn.commit()
+            return record
+
+        monkeypatch.setattr(database, "get_metadata", get_then_delete)
+
+        assert await database.update_metadata("chart-1", {"short_alt": "x"}) is None
+        assert not database.conn.in_transaction
+
+    @pytest.mark.asyncio
+    async def test_delete(self, database):
+        """Test deleting a record removes it and its tags."""
+        await database.create_metadata(make_metadata("chart-1", tags=["finance"]))
+
+        assert await database.delete_metadata("chart-1") is True
+        assert await database.delete_metadata("chart-1") is False
+        assert await database.get_metadata("chart-1") is None
+        assert await database.list_metadata(tags=["finance"]) == []
+
+    @pytest.mark.asyncio
+    async def test_update_racing_delete_leaves_no_tags(self, database):
+        """Test a tag update racing a delete doesn't leave orphan tag rows."""
+        await database.create_metadata(make_metadata("chart-1"))
+
+        await asyncio.gather(
+            database.update_metadata("chart-1", {"tags": ["orphan"]}),
+            database.delete_metadata("chart-1"),
+        )
+
+        async with database.conn.execute("SELECT * FROM metadata_tags") as cursor:
+            assert await cursor.fetchall() == []
+        await database.create_metadata(make_metadata("chart-1"))
+        assert await database.list_metadata(tags=["orphan"]) == []
+
+
+class TestListMetadata:
+    """Test listing and filtering records."""
+
+    @pytest.mark.asyncio
+    async def test_filter_by_tag(self, database):
+        """Test tag filters match records carrying any of the tags exactly."""
+        await database.bulk_create_metadata([
+            make_metadata("chart-1", tags=["finance", "charts"]),
+            make_metadata("chart-2", tags=["charts"]),
+            make_metadata("chart-3", tags=["finance-2024"]),
+            make_metadata("video-1", content_type="video", tags=["finance"]),
+        ])
+
+        def ids(records):
+            return sorted(record["id"] for record in records)
+
+        finance = await database.list_metadata(tags=["finance"])
+        assert ids(finance) == ["chart-1", "video-1"]
+
+        either = await database.list_metadata(tags=["charts", "finance-2024"])
+        assert ids(either) == ["chart-1", "chart-2", "chart-3"]
+
+        images = await database.list_metadata(type_filter="image", tags=["finance"])
+        assert ids(images) == ["chart-1"]
+        assert await database.list_metadata(tags=["missing"]) == []
+
+    @pytest.mark.asyncio
+    async def test_tag_index_backfill(self, tmp_path):
+        """Test databases created before the tag table get it filled in."""
+        path = str(tmp_path / "eamp.db")
+        old = DatabaseManager(path)
+        await old.initialize()
+        await old.create_metadata(make_metadata("chart-1", tags=["finance"]))
+        await old.conn.execute("DROP TABLE metadata_tags")
+        await old.conn.commit()
+        await old.close()
+
+        upgraded = DatabaseManager(path)
+        await upgraded.initialize()
+        try:
+            records = await upgraded.list_metadata(tags=["finance"])
+            assert [record["id"] for record in records] == ["chart-1"]
+        finally:
+            await upgraded.close()
+
+
+async def list_all_pages(database, page_size, **filters):
+    """Walk every page of list_metadata using the keyset cursor."""
+    records = []
+    cursor = None
+    while True:
+        page = await database.list_metadata(limit=page_size, cursor=cursor, **filters)
+        records.extend(page)
+        if len(page) < page_size:
+            return records
+        cursor = database.make_cursor(page[-1])
+
+
+class TestCursorPagination:
+    """Test keyset pagination of list_metadata."""
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_every_record_once(self, database):
+        """Test cursor pages match the offset listing, including timestamp ties."""
+        # One bulk insert gives every record the same updated_at
+        await database.bulk_create_metadata(
+            [make_metadata(f"chart-{i:02d}") for i in range(7)]
+        )
+        for i in range(3):
+            await database.create_metadata(make_metadata(f"video-{i}", "video"))
+
+        expected = await database.list_metadata(limit=100)
+        paged = await list_all_pages(database, page_size=3)
+
+        assert len(expected) == 10
+        assert [record["id"] for record in paged] == [
+            record["id"] for record in expected
+        ]
+
+    @pytest.mark.asyncio
+    async def test_pages_with_filter(self, database):
+        """Test the cursor combines with type filters."""
+        await database.bulk_create_metadata(
+            [make_metadata(f"chart-{i}") for i in range(5)]
+            + [make_metadata(f"video-{i}", "video") for i in range(5)]
+        )
+
+        paged = await list_all_pages(database, page_size=2, type_filter="video")
+
+        assert sorted(record["id"] for record in paged) == [
+            f"video-{i}" for i in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_newest_first(self, database):
+        """Test records are listed by most recent update first."""
+        for i in range(3):
+            await database.create_metadata(make_metadata(f"chart-{i}"))
+        await database.update_metadata("chart-0", {"short_alt": "Updated"})
+
+        records = await database.list_metadata()
+
+        assert [record["id"] for record in records] == ["chart-0", "chart-2", "chart-1"]
@@ -0,0 +1,93 @@
+"""
+msgspec mirrors of the EAMP models for the optional fast decode path.
+
+Requires the ``msgspec`` package (``pip install eamp-python-sdk[fast]``).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import msgspec
+from typing_extensions import Annotated
+
+from .models import (
+    EAMP_VERSION_PATTERN,
+    SCENE_TIME_PATTERN,
+    ContentType,
+    ElementSize,
+    VisualElementType,
+)
+
+
+NonEmptyStr = Annotated[str, msgspec.Meta(min_length=1)]
+ShortAlt = Annotated[str, msgspec.Meta(min_length=1, max_length=250)]
+EAMPVersion = Annotated[str, msgspec.Meta(pattern=EAMP_VERSION_PATTERN)]
+SceneTime = Annotated[str, msgspec.Meta(pattern=SCENE_TIME_PATTERN)]
+
+
+class DataPointStruct(msgspec.Struct, omit_defaults=True):
+    """Mirror of DataPoint"""
+    label: NonEmptyStr
+    value: Union[str, int, float, bool]
+    unit: Optional[str] = None
+    category: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class SceneStruct(msgspec.Struct, omit_defaults=True):
+    """Mirror of Scene"""
+    time: SceneTime
+    description: NonEmptyStr
+    speakers: Optional[List[str]] = None
+    visual_elements: Optional[List[str]] = None
+    audio_elements: Optional[List[str]] = None
+
+
+class VisualElementStruct(msgspec.Struct, omit_defaults=True):
+    """Mirror of VisualElement"""
+    type: VisualElementType
+    description: NonEmptyStr
+    position: Optional[str] = None
+    color: Optional[str] = None
+    size: Optional[ElementSize] = None
+
+
+class ContextStruct(msgspec.Struct, omit_defaults=True):
+    """Mirror of Context"""
+    page_title: Optional[str] = None
+    section_heading: Optional[str] = None
+    surrounding_text: Optional[str] = None
+    purpose: Optional[str] = None
+    user_task: Optional[str] = None
+    related_elements: Optional[List[str]] = None
+
+
+class EAMPMetadataStruct(msgspec.Struct, omit_defaults=True):
+    """Mirror of EAMPMetadata"""
+    id: NonEmptyStr
+    type: ContentType
+    short_alt: ShortAlt
+    extended_description: NonEmptyStr
+    eamp_version: EAMPVersion = "1.0.0"
+    data_points: Optional[List[DataPointStruct]] = None
+    transcript: Optional[str] = None
+    scenes: Optional[List[SceneStruct]] = None
+    visual_elements: Optional[List[VisualElementStruct]] = None
+    accessibility_features: Optional[List[str]] = None
+    tags: Optional[List[str]] = None
+    source_attribution: Optional[str] = None
+    # Validated as an HttpUrl when the model is constructed
+    metadata_uri: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    context: Optional[ContextStruct] = None
+
+
+# Decoders are reusable and cheaper than passing type= on every call
+METADATA_DECODER = msgspec.json.Decoder(EAMPMetadataStruct)
+
+
+def struct_to_builtins(struct: EAMPMetadataStruct) -> Dict[str, Any]:
+    """Convert a decoded struct tree to plain data, keeping datetimes"""
+    return msgspec.to_builtins(struct, builtin_types=(datetime,))
@@ -3,20 +3,48 @@ EAMP Python Client for consuming accessibility metadata
 """
 
 import asyncio
-import json
 import logging
-from typing import Any, Callable, Dict, List, Optional, Set
+import math
+import string
+from collections import defaultdict, deque
+from datetime import datetime
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 from urllib.parse import quote
 
 import httpx
-from pydantic import ValidationError as PydanticValidationError
+import orjson
+import websockets
+from pydantic import HttpUrl, TypeAdapter, ValidationError as PydanticValidationError
+from pydantic_core import from_json
 
 from .models import (
     EAMPMetadata,
+    ContentType,
+    Context,
+    DataPoint,
+    ElementSize,
+    Scene,
+    VisualElement,
+    VisualElementType,
     MetadataFilter, 
     MetadataUpdate,
     ClientOptions,
-    EAMPError as EAMPErrorModel
 )
 from .exceptions import (
     EAMPError,
@@ -28,12 +56,155 @@ from .exceptions import (
     RateLimitError,
     ServerError,
     TimeoutError,
+    ConfigurationError,
 )
-from .utils import MemoryCache
+from .utils import MemoryCache, build_query_string
 
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _HTTP2_AVAILABLE = False
+
+try:
+    from . import _fast_models
+    _MSGSPEC_ERRORS: Tuple[Type[Exception], ...] = (_fast_models.msgspec.DecodeError,)
+except ImportError:  # pragma: no cover - optional dependency
+    _fast_models = None
+    _MSGSPEC_ERRORS = ()
+
+try:
+    import ijson
+    _IJSON_ERRORS: Tuple[Type[Exception], ...] = (ijson.JSONError,)
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+    _IJSON_ERRORS = ()
+
+# Retry backoff: 0.2s, 0.4s, 0.8s, ... capped at 30s
+_RETRY_BASE_DELAY = 0.2
+_RETRY_MAX_DELAY = 30.0
+
+# Characters that never need escaping in a URL path segment
+_UNRESERVED_CHARS = frozenset(string.ascii_letters + string.digits + "-_.~")
+
+# Compiled once; parses and validates list responses in a single pass
+_METADATA_LIST_ADAPTER = TypeAdapter(List[EAMPMetadata])
+
+# Scalar fields converted from their JSON form when constructing trusted data
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+_URL_ADAPTER = TypeAdapter(HttpUrl)
+_DATETIME_FIELDS = ("created_at", "updated_at", "expires_at")
+
+
+def _quote_path(value: str) -> str:
+    """URL-quote a path segment, skipping quote() for already-safe values"""
+    return value if _UNRESERVED_CHARS.issuperset(value) else quote(value)
+
+
+def _metadata_list_url(filter_obj: Optional[MetadataFilter]) -> str:
+    """Build the /metadata URL with the filter encoded as its query string"""
+    query = build_query_string(filter_obj) if filter_obj else ""
+    return "/metadata?" + query if query else "/metadata"
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[int]:
+    """Parse a Retry-After header given in seconds"""
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+class _AsyncByteReader:
+    """Async file-like adapter over a byte iterator, for ijson"""
+    __slots__ = ('_chunks', '_pending')
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+        self._pending = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the type with read(0) and accepts short reads; empty
+        # bytes means EOF
+        if not size:
+            return b""
+        if self._pending:
+            chunk, self._pending = self._pending, b""
+            return chunk
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+    async def peek(self) -> bytes:
+        """Return the first non-whitespace byte without consuming it (b"" at EOF)"""
+        while not self._pending:
+            chunk = await self.read()
+            if not chunk:
+                return b""
+            self._pending = chunk.lstrip()
+        return self._pending[:1]
+
+
+def _construct_visual_element(data: Dict[str, Any]) -> VisualElement:
+    """Build a VisualElement from trusted data without validation"""
+    element = dict(data)
+    element["type"] = VisualElementType(element["type"])
+    if element.get("size") is not None:
+        element["size"] = ElementSize(element["size"])
+    return VisualElement.model_construct(**element)
+
+
+def _construct_metadata(data: Dict[str, Any]) -> EAMPMetadata:
+    """
+    Build EAMPMetadata from trusted server data without running validators
+    
+    Nested models and enums are constructed in a single walk over the known
+    schema, and timestamps and ``metadata_uri`` are converted to the field
+    types; all other values are kept exactly as the server sent them.
+    """
+    fields = dict(data)
+    fields["type"] = ContentType(fields["type"])
+    
+    for name in _DATETIME_FIELDS:
+        if isinstance(fields.get(name), str):
+            fields[name] = _DATETIME_ADAPTER.validate_python(fields[name])
+    if isinstance(fields.get("metadata_uri"), str):
+        fields["metadata_uri"] = _URL_ADAPTER.validate_python(fields["metadata_uri"])
+    
+    if fields.get("data_points"):
+        fields["data_points"] = [DataPoint.model_construct(**dp) for dp in fields["data_points"]]
+    if fields.get("scenes"):
+        fields["scenes"] = [Scene.model_construct(**scene) for scene in fields["scenes"]]
+    if fields.get("visual_elements"):
+        fields["visual_elements"] = [_construct_visual_element(ve) for ve in fields["visual_elements"]]
+    if fields.get("context"):
+        fields["context"] = Context.model_construct(**fields["context"])
+    
+    return EAMPMetadata.model_construct(**fields)
+
+
+def _construct_trusted(data: Any) -> EAMPMetadata:
+    """Run _construct_metadata, reporting malformed data as ValidationError"""
+    try:
+        return _construct_metadata(data)
+    except KeyError as e:
+        raise ValidationError(f"Invalid metadata format: missing field {e}", field=e.args[0])
+    except (TypeError, ValueError) as e:
+        # pydantic's ValidationError is a ValueError too
+        raise ValidationError(f"Invalid metadata format: {str(e)}")
+
+
+def _loads_response(content: bytes) -> Any:
+    """Parse a JSON response body, reporting bad JSON as ValidationError"""
+    try:
+        return from_json(content)
+    except ValueError as e:
+        raise ValidationError(f"Invalid JSON response: {str(e)}")
+
 
 class EAMPClient:
     """
@@ -56,14 +227,45 @@ class EAMPClient:
         self.options = options or ClientOptions()
         self._http_client: Optional[httpx.AsyncClient] = None
         self._cache: Optional[MemoryCache[EAMPMetadata]] = None
-        self._subscriptions: Set[str] = set()
-        self._update_callbacks: Dict[str, List[Callable[[MetadataUpdate], None]]] = {}
+        # A resource is subscribed while it has at least one callback
+        self._update_callbacks: DefaultDict[str, List[Callable[[MetadataUpdate], None]]] = defaultdict(list)
+        self._subscriptions_snapshot: Optional[Tuple[str, ...]] = None
+        self._trust_server = self.options.trust_server
+        self._fast_decode = self.options.fast_decode
+        if self._fast_decode and _fast_models is None:
+            raise ConfigurationError("fast_decode requires the msgspec package")
+
+        # Request headers are fixed for the client's lifetime
+        headers = {
+            "Accept": "application/eamp+json, application/json",
+            "Content-Type": "application/json",
+            **(self.options.headers or {})
+        }
+        if self.options.user_agent:
+            headers["User-Agent"] = self.options.user_agent
+        self._headers: Mapping[str, str] = MappingProxyType(headers)
+
+        # Update stream: one reader task fills the inbox, one consumer drains it
+        self._ws: Optional[Any] = None
+        self._ws_reader: Optional[asyncio.Task] = None
+        self._ws_consumer: Optional[asyncio.Task] = None
+        self._ws_wake: Optional[asyncio.Future] = None
+        self._ws_inbox: Deque[Optional[Union[str, bytes]]] = deque()
         
         if self.options.cache_enabled:
-            self._cache = MemoryCache[EAMPMetadata](ttl=self.options.cache_ttl)
+            self._cache = MemoryCache[EAMPMetadata](
+                ttl=self.options.cache_ttl,
+                track_stats=self.options.cache_track_stats,
+                clock_resolution=self.options.cache_clock_resolution,
+            )
+
+        # Build the HTTP client up front so requests don't have to
+        if self.options.base_url:
+            self._open_http_client()
 
     async def __aenter__(self):
-        await self._ensure_http_client()
+        if not self._http_client:
+            self._open_http_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -88,17 +290,68 @@ class EAMPClient:
             raise ValidationError("Resource ID is required")
 
         # Check cache first
-        if self._cache:
+        if self._cache is not None:
             cached = self._cache.get(resource_id)
             if cached:
-                logger.debug(f"Cache hit for resource: {resource_id}")
+                logger.debug("Cache hit for resource: %s", resource_id)
                 return cached
 
+        return await self._fetch_metadata(resource_id, validate=not self._trust_server)
+
+    async def get_many(self, resource_ids: List[str], concurrency: int = 16) -> List[EAMPMetadata]:
+        """
+        Get metadata for several resources concurrently
+        
+        Duplicate IDs are fetched once and cached entries are served without
+        a request; at most ``concurrency`` requests are in flight at a time.
+        
+        Args:
+            resource_ids: Resource identifiers to fetch
+            concurrency: Maximum number of concurrent requests
+            
+        Returns:
+            EAMPMetadata objects in the same order as ``resource_ids``
+        """
+        if concurrency < 1:
+            raise ValidationError("Concurrency must be at least 1", field="concurrency")
+
+        results: Dict[str, EAMPMetadata] = {}
+        missing = []
+        for resource_id in dict.fromkeys(resource_ids):
+            cached = self._cache.get(resource_id) if self._cache is not None and resource_id else None
+            if cached:
+                results[resource_id] = cached
+            else:
+                missing.append(resource_id)
+
+        if missing:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def fetch(resource_id: str) -> EAMPMetadata:
+                async with semaphore:
+                    return await self.get_metadata(resource_id)
+
+            tasks = [asyncio.ensure_future(fetch(resource_id)) for resource_id in missing]
+            try:
+                fetched = await asyncio.gather(*tasks)
+            except BaseException:
+                # gather leaves the other fetches running; stop them and
+                # collect their results so no exception goes unretrieved
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            results.update(zip(missing, fetched))
+
+        return [results[resource_id] for resource_id in resource_ids]
+
+    async def _fetch_metadata(self, resource_id: str, validate: bool = True) -> EAMPMetadata:
+        """Fetch metadata from the server and cache it"""
         try:
-            await self._ensure_http_client()
+            http_client = self._http_client or self._open_http_client()
             
-            url = f"/metadata/{quote(resource_id)}"
-            response = await self._http_client.get(url)
+            url = f"/metadata/{_quote_path(resource_id)}"
+            response = await self._send_with_retry(lambda: http_client.get(url))
             
             if response.status_code == 404:
                 raise ResourceNotFoundError(f"Resource not found: {resource_id}")
@@ -107,27 +360,36 @@ class EAMPClient:
             elif response.status_code == 403:
                 raise AuthorizationError("Access denied")
             elif response.status_code == 429:
-                retry_after = response.headers.get("Retry-After")
-                raise RateLimitError("Rate limit exceeded", retry_after=int(retry_after) if retry_after else None)
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                raise RateLimitError("Rate limit exceeded", retry_after=retry_after)
             elif response.status_code >= 500:
                 raise ServerError(f"Server error: {response.status_code}", response.status_code)
             elif not response.is_success:
-                # Try to parse error response
+                # Try to parse error response; plain dict access is enough
+                # for the two fields we need
                 try:
-                    error_data = response.json()
-                    error_model = EAMPErrorModel.parse_obj(error_data)
-                    raise EAMPError(error_model.error["message"], code=error_model.error.get("code", "UNKNOWN"))
-                except (json.JSONDecodeError, PydanticValidationError):
+                    error = orjson.loads(response.content).get("error")
+                except (orjson.JSONDecodeError, AttributeError):
+                    error = None
+                if not isinstance(error, dict):
                     raise NetworkError(f"HTTP {response.status_code}: {response.text}")
-
-            # Parse successful response
-            data = response.json()
-            metadata = EAMPMetadata.parse_obj(data)
+                raise EAMPError(error.get("message", response.text), code=error.get("code", "UNKNOWN"))
+
+            if validate and self._fast_decode:
+                # msgspec validates the payload and metadata_uri is checked
+                # as the model is built, skipping the pydantic model validators
+                struct = _fast_models.METADATA_DECODER.decode(response.content)
+                metadata = _construct_trusted(_fast_models.struct_to_builtins(struct))
+            elif validate:
+                # Parse and validate the successful response in one pass
+                metadata = EAMPMetadata.model_validate_json(response.content)
+            else:
+                metadata = _construct_trusted(_loads_response(response.content))
 
             # Cache the result
-            if self._cache:
+            if self._cache is not None:
                 self._cache.set(resource_id, metadata)
-                logger.debug(f"Cached metadata for resource: {resource_id}")
+                logger.debug("Cached metadata for resource: %s", resource_id)
 
             return metadata
 
@@ -137,6 +399,8 @@ class EAMPClient:
             raise NetworkError(f"Network error: {str(e)}")
         except PydanticValidationError as e:
             raise ValidationError(f"Invalid metadata format: {str(e)}")
+        except _MSGSPEC_ERRORS as e:
+            raise ValidationError(f"Invalid metadata format: {str(e)}")
 
     async def list_metadata(self, filter_obj: Optional[MetadataFilter] = None) -> List[EAMPMetadata]:
         """
@@ -148,39 +412,74 @@ class EAMPClient:
         Returns:
             List of EAMPMetadata objects
         """
-        await self._ensure_http_client()
+        http_client = self._http_client or self._open_http_client()
         
-        params = {}
-        if filter_obj:
-            if filter_obj.type:
-                params["type"] = filter_obj.type.value
-            if filter_obj.tags:
-                params["tags"] = ",".join(filter_obj.tags)
-            if filter_obj.accessibility_features:
-                params["features"] = ",".join(filter_obj.accessibility_features)
-            if filter_obj.created_after:
-                params["createdAfter"] = filter_obj.created_after.isoformat()
-            if filter_obj.created_before:
-                params["createdBefore"] = filter_obj.created_before.isoformat()
-            if filter_obj.has_data_points is not None:
-                params["hasDataPoints"] = str(filter_obj.has_data_points).lower()
-            if filter_obj.language:
-                params["language"] = filter_obj.language
+        url = _metadata_list_url(filter_obj)
 
         try:
-            response = await self._http_client.get("/metadata", params=params)
+            response = await self._send_with_retry(
+                lambda: http_client.get(url)
+            )
             response.raise_for_status()
             
-            data = response.json()
-            if not isinstance(data, list):
-                raise ValidationError("Expected list of metadata objects")
+            if self._trust_server:
+                data = _loads_response(response.content)
+                if not isinstance(data, list):
+                    raise ValidationError("Expected list of metadata objects")
+                return [_construct_trusted(item) for item in data]
+
+            return _METADATA_LIST_ADAPTER.validate_json(response.content)
+
+        except httpx.HTTPStatusError as e:
+            raise NetworkError(f"HTTP {e.response.status_code}: {e.response.text}")
+        except PydanticValidationError as e:
+            raise ValidationError(f"Invalid metadata format: {str(e)}")
+
+    async def iter_metadata(self, filter_obj: Optional[MetadataFilter] = None) -> AsyncIterator[EAMPMetadata]:
+        """
+        Iterate over metadata with optional filtering, one record at a time
+        
+        With ``ijson`` installed the response body is parsed incrementally, so
+        memory stays bounded by a single record instead of the whole listing.
+        
+        Args:
+            filter_obj: Optional filter criteria
+            
+        Yields:
+            EAMPMetadata objects
+        """
+        http_client = self._http_client or self._open_http_client()
+        url = _metadata_list_url(filter_obj)
+        build = _construct_trusted if self._trust_server else EAMPMetadata.model_validate
 
-            return [EAMPMetadata.parse_obj(item) for item in data]
+        try:
+            async with http_client.stream("GET", url) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+
+                if ijson is None:
+                    data = _loads_response(await response.aread())
+                    if not isinstance(data, list):
+                        raise ValidationError("Expected list of metadata objects")
+                    for item in data:
+                        yield build(item)
+                    return
+
+                reader = _AsyncByteReader(response.aiter_bytes())
+                # ijson.items only matches array items, so anything else at
+                # the top level would silently yield nothing
+                if await reader.peek() != b"[":
+                    raise ValidationError("Expected list of metadata objects")
+                async for item in ijson.items(reader, "item", use_float=True):
+                    yield build(item)
 
         except httpx.HTTPStatusError as e:
             raise NetworkError(f"HTTP {e.response.status_code}: {e.response.text}")
         except PydanticValidationError as e:
             raise ValidationError(f"Invalid metadata format: {str(e)}")
+        except _IJSON_ERRORS as e:
+            raise ValidationError(f"Invalid JSON response: {str(e)}")
 
     async def subscribe(self, resource_id: str, callback: Callable[[MetadataUpdate], None]) -> None:
         """
@@ -194,16 +493,18 @@ class EAMPClient:
             raise ValidationError("Resource ID is required")
 
         # Store callback
-        if resource_id not in self._update_callbacks:
-            self._update_callbacks[resource_id] = []
+        is_new = resource_id not in self._update_callbacks
         self._update_callbacks[resource_id].append(callback)
-        
-        self._subscriptions.add(resource_id)
-        logger.info(f"Subscribed to updates for resource: {resource_id}")
+        if is_new:
+            self._subscriptions_snapshot = None
+        logger.info("Subscribed to updates for resource: %s", resource_id)
 
-        # TODO: Implement WebSocket connection for real-time updates
-        # This would involve connecting to a WebSocket endpoint and
-        # setting up message handlers for update events
+        if self.options.websocket_url:
+            if self._ws is None:
+                # Connecting subscribes every resource registered so far
+                await self._connect_websocket()
+            elif is_new:
+                await self._send_ws_message("subscribe", resource_id)
 
     async def unsubscribe(self, resource_id: str, callback: Optional[Callable[[MetadataUpdate], None]] = None) -> None:
         """
@@ -213,26 +514,42 @@ class EAMPClient:
             resource_id: Resource to stop monitoring
             callback: Specific callback to remove (if None, removes all callbacks)
         """
-        if resource_id in self._subscriptions:
-            if callback and resource_id in self._update_callbacks:
+        callbacks = self._update_callbacks.get(resource_id)
+        if callbacks is not None:
+            if callback:
                 try:
-                    self._update_callbacks[resource_id].remove(callback)
-                    if not self._update_callbacks[resource_id]:
-                        del self._update_callbacks[resource_id]
-                        self._subscriptions.remove(resource_id)
+                    callbacks.remove(callback)
                 except ValueError:
                     pass
+                if not callbacks:
+                    del self._update_callbacks[resource_id]
             else:
                 # Remove all callbacks for this resource
-                self._update_callbacks.pop(resource_id, None)
-                self._subscriptions.remove(resource_id)
+                del self._update_callbacks[resource_id]
+
+            if resource_id not in self._update_callbacks:
+                self._subscriptions_snapshot = None
+                # Entries pinned by the subscription would never expire otherwise
+                if self._cache is not None:
+                    self._cache.delete(resource_id)
+                if self._ws is not None:
+                    await self._send_ws_message("unsubscribe", resource_id)
             
-            logger.info(f"Unsubscribed from updates for resource: {resource_id}")
+            logger.info("Unsubscribed from updates for resource: %s", resource_id)
 
     async def unsubscribe_all(self) -> None:
         """Unsubscribe from all metadata updates"""
-        self._subscriptions.clear()
-        self._update_callbacks.clear()
+        # Snapshot so subscribe() can run while a message is being sent;
+        # subscriptions made meanwhile for other resources are kept
+        resource_ids = tuple(self._update_callbacks)
+        for resource_id in resource_ids:
+            if self._cache is not None:
+                self._cache.delete(resource_id)
+            if self._ws is not None:
+                await self._send_ws_message("unsubscribe", resource_id)
+        for resource_id in resource_ids:
+            self._update_callbacks.pop(resource_id, None)
+        self._subscriptions_snapshot = None
         logger.info("Unsubscribed from all updates")
 
     async def refresh_metadata(self, resource_id: str) -> EAMPMetadata:
@@ -245,74 +562,238 @@ class EAMPClient:
         Returns:
             Fresh EAMPMetadata object
         """
+        if not resource_id:
+            raise ValidationError("Resource ID is required")
+
         # Clear from cache
-        if self._cache:
+        if self._cache is not None:
             self._cache.delete(resource_id)
         
-        return await self.get_metadata(resource_id)
+        # Refreshes are always fully validated, even for trusted servers
+        return await self._fetch_metadata(resource_id, validate=True)
 
     def is_subscribed(self, resource_id: str) -> bool:
         """Check if subscribed to a resource"""
-        return resource_id in self._subscriptions
+        return resource_id in self._update_callbacks
 
-    def get_subscriptions(self) -> List[str]:
-        """Get list of subscribed resource IDs"""
-        return list(self._subscriptions)
+    def get_subscriptions(self) -> Tuple[str, ...]:
+        """Get subscribed resource IDs (an immutable snapshot, reused until they change)"""
+        if self._subscriptions_snapshot is None:
+            self._subscriptions_snapshot = tuple(self._update_callbacks)
+        return self._subscriptions_snapshot
 
     def clear_cache(self) -> None:
         """Clear all cached metadata"""
-        if self._cache:
+        if self._cache is not None:
             self._cache.clear()
             logger.info("Cache cleared")
 
     def get_cache_stats(self) -> Optional[Dict[str, Any]]:
         """Get cache statistics"""
-        return self._cache.get_stats() if self._cache else None
+        return self._cache.get_stats() if self._cache is not None else None
 
     async def close(self) -> None:
         """Close client and cleanup resources"""
         await self.unsubscribe_all()
+        await self._close_websocket()
         
         if self._http_client:
             await self._http_client.aclose()
             self._http_client = None
         
-        if self._cache:
+        if self._cache is not None:
             self._cache.clear()
 
-    async def _ensure_http_client(self) -> None:
-        """Ensure HTTP client is initialized"""
-        if not self._http_client:
-            if not self.options.base_url:
-                raise ValidationError("Base URL is required")
-            
-            headers = {
-                "Accept": "application/eamp+json, application/json",
-                "Content-Type": "application/json",
-                **(self.options.headers or {})
-            }
-            
-            if self.options.user_agent:
-                headers["User-Agent"] = self.options.user_agent
+    async def _connect_websocket(self) -> None:
+        """Open the update stream and subscribe to all registered resources"""
+        try:
+            self._ws = await websockets.connect(self.options.websocket_url)
+        except (OSError, websockets.WebSocketException) as e:
+            raise NetworkError(f"WebSocket connection failed: {str(e)}")
+
+        loop = asyncio.get_running_loop()
+        self._ws_wake = loop.create_future()
+        self._ws_reader = loop.create_task(self._ws_read_loop(self._ws))
+        self._ws_consumer = loop.create_task(self._ws_consume_loop())
+
+        for resource_id in self._update_callbacks:
+            await self._send_ws_message("subscribe", resource_id)
+
+    async def _close_websocket(self) -> None:
+        """Stop the update stream tasks and close the connection"""
+        # Take the socket first: the cancelled reader clears self._ws
+        ws = self._ws
+        tasks = [task for task in (self._ws_reader, self._ws_consumer) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if ws is not None:
+            await ws.close()
+        self._ws = self._ws_reader = self._ws_consumer = self._ws_wake = None
+        self._ws_inbox.clear()
+
+    async def _send_ws_message(self, message_type: str, resource_id: str) -> None:
+        """Send a subscribe/unsubscribe message on the update stream"""
+        try:
+            await self._ws.send(orjson.dumps({"type": message_type, "resourceId": resource_id}).decode())
+        except websockets.ConnectionClosed as e:
+            logger.warning("Could not %s %s, WebSocket closed: %s", message_type, resource_id, e)
 
-            timeout = httpx.Timeout(self.options.timeout)
-            
-            self._http_client = httpx.AsyncClient(
-                base_url=str(self.options.base_url),
-                timeout=timeout,
-                headers=headers,
-                follow_redirects=True,
+    async def _ws_read_loop(self, ws: Any) -> None:
+        """Queue incoming frames and wake the consumer; no per-message tasks"""
+        inbox = self._ws_inbox
+        try:
+            async for message in ws:
+                inbox.append(message)
+                wake = self._ws_wake
+                if not wake.done():
+                    wake.set_result(None)
+        except websockets.ConnectionClosedError as e:
+            logger.warning("WebSocket connection lost: %s", e)
+        finally:
+            # None tells the consumer to stop once the backlog is drained; the
+            # next subscribe() reconnects
+            inbox.append(None)
+            if not self._ws_wake.done():
+                self._ws_wake.set_result(None)
+            if self._ws is ws:
+                self._ws = None
+
+    async def _ws_consume_loop(self) -> None:
+        """Drain queued frames in batches and dispatch them inline"""
+        loop = asyncio.get_running_loop()
+        inbox = self._ws_inbox
+        while True:
+            await self._ws_wake
+            self._ws_wake = loop.create_future()
+            while inbox:
+                message = inbox.popleft()
+                if message is None:
+                    # Nothing invalidates the pinned entries once the stream
+                    # is gone, so drop them rather than serve them stale
+                    if self._cache is not None:
+                        for resource_id in tuple(self._update_callbacks):
+                            self._cache.delete(resource_id)
+                    return
+                self._dispatch_ws_message(message)
+
+    def _dispatch_ws_message(self, raw: Union[str, bytes]) -> None:
+        """Turn a metadata_updated frame into a MetadataUpdate and handle it"""
+        try:
+            message = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            logger.warning("Invalid WebSocket message: %s", e)
+            return
+
+        message_type = message.get("type") if isinstance(message, dict) else None
+        if message_type == "error":
+            logger.warning("WebSocket error from server: %s", message.get('message'))
+        if message_type != "metadata_updated":
+            return
+
+        try:
+            update = MetadataUpdate(
+                resource_id=message["resourceId"],
+                change_type=message["changeType"],
+                timestamp=message["timestamp"],
+                metadata=message.get("metadata"),
             )
+        except (KeyError, PydanticValidationError) as e:
+            logger.warning("Invalid metadata update message: %s", e)
+            return
+
+        self._handle_update(update.resource_id, update)
+
+    async def _send_with_retry(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Send a request, retrying transient failures with exponential backoff
+        
+        Timeouts, connection errors and 5xx responses are retried up to
+        ``retry_attempts`` times; 429 responses wait for ``Retry-After`` when it
+        is short enough. The last response is returned for normal status handling.
+        """
+        attempts = self.options.retry_attempts
+        for attempt in range(attempts + 1):
+            delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** attempt)
+            try:
+                response = await send()
+            except (httpx.TimeoutException, httpx.NetworkError):
+                if attempt == attempts:
+                    raise
+            else:
+                if attempt == attempts:
+                    return response
+                if response.status_code == 429:
+                    retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        if retry_after > _RETRY_MAX_DELAY:
+                            return response
+                        delay = retry_after
+                elif response.status_code < 500:
+                    return response
+
+            logger.debug("Retrying request (attempt %s of %s) in %ss", attempt + 2, attempts + 1, delay)
+            await asyncio.sleep(delay)
+
+    def _open_http_client(self) -> httpx.AsyncClient:
+        """Create the HTTP client (HTTP/2 with a pooled connection set)"""
+        if not self.options.base_url:
+            raise ValidationError("Base URL is required")
+
+        timeout = httpx.Timeout(self.options.timeout)
+        limits = httpx.Limits(
+            max_connections=self.options.max_connections,
+            max_keepalive_connections=self.options.max_keepalive_connections,
+        )
+        
+        self._http_client = httpx.AsyncClient(
+            base_url=str(self.options.base_url),
+            timeout=timeout,
+            headers=self._headers,
+            follow_redirects=True,
+            http2=self.options.http2 and _HTTP2_AVAILABLE,
+            limits=limits,
+        )
+        return self._http_client
+
+    def broadcast(self, resource_ids: Iterable[str], update: MetadataUpdate) -> None:
+        """
+        Dispatch an update to the subscribers of several resources
+        
+        Callbacks run synchronously, in subscription order.
+        
+        Args:
+            resource_ids: Resources the update applies to
+            update: Update event to deliver
+        """
+        for resource_id in resource_ids:
+            self._handle_update(resource_id, update)
 
     def _handle_update(self, resource_id: str, update: MetadataUpdate) -> None:
         """Handle incoming metadata update"""
-        if resource_id in self._update_callbacks:
-            for callback in self._update_callbacks[resource_id]:
-                try:
-                    callback(update)
-                except Exception as e:
-                    logger.error(f"Error in update callback for {resource_id}: {e}")
-
-        # Update cache if we have new metadata
-        if self._cache and update.metadata:
-            self._cache.set(resource_id, update.metadata)
\ No newline at end of file
+        # Snapshot so callbacks can (un)subscribe while being dispatched
+        callbacks = tuple(self._update_callbacks.get(resource_id, ()))
+
+        # Updates are authoritative for the cache: subscribed entries are kept
+        # without a TTL and invalidated when the resource changes (or when
+        # the update stream ends).
+        # This runs first so a failing callback cannot skip invalidation.
+        if self._cache is not None:
+            if update.change_type == "deleted" or update.metadata is None:
+                self._cache.delete(resource_id)
+            else:
+                ttl = math.inf if callbacks else None
+                self._cache.set(resource_id, update.metadata, custom_ttl=ttl)
+
+        errors = []
+        for callback in callbacks:
+            try:
+                callback(update)
+            except Exception as e:
+                errors.append(e)
+
+        if errors:
+            logger.error(
+                "%d update callback(s) failed for %s: %s",
+                len(errors), resource_id, "; ".join(repr(e) for e in errors)
+            )
\ No newline at end of file
@@ -2,11 +2,23 @@
 EAMP Python SDK exceptions
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+
+def _restore_error(
+    cls: type, args: Tuple[Any, ...], state: Dict[str, Any]
+) -> "EAMPError":
+    """Rebuild a pickled or copied error without re-running ``__init__``"""
+    error = cls.__new__(cls, *args)
+    for name, value in state.items():
+        setattr(error, name, value)
+    return error
 
 
 class EAMPError(Exception):
     """Base EAMP error"""
+    # Slots keep error attributes out of a per-instance __dict__
+    __slots__ = ('code', 'field', 'details')
     
     def __init__(
         self, 
@@ -20,6 +32,16 @@ class EAMPError(Exception):
         self.field = field
         self.details = details or {}
 
+    def __reduce__(self):
+        # BaseException only pickles args and __dict__; slotted attributes
+        # have to be carried over explicitly
+        state = dict(self.__dict__)
+        for klass in type(self).__mro__:
+            for name in getattr(klass, '__slots__', ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return _restore_error, (type(self), self.args, state)
+
     def __str__(self) -> str:
         return f"[{self.code}] {super().__str__()}"
 
@@ -29,6 +51,7 @@ class EAMPError(Exception):
 
 class ResourceNotFoundError(EAMPError):
     """Resource not found error"""
+    __slots__ = ()
     
     def __init__(self, message: str):
         super().__init__(message, code="RESOURCE_NOT_FOUND")
@@ -36,6 +59,7 @@ class ResourceNotFoundError(EAMPError):
 
 class ValidationError(EAMPError):
     """Validation error"""
+    __slots__ = ()
     
     def __init__(self, message: str, field: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         super().__init__(message, code="VALIDATION_ERROR", field=field, details=details)
@@ -43,6 +67,7 @@ class ValidationError(EAMPError):
 
 class NetworkError(EAMPError):
     """Network error"""
+    __slots__ = ()
     
     def __init__(self, message: str):
         super().__init__(message, code="NETWORK_ERROR")
@@ -50,6 +75,7 @@ class NetworkError(EAMPError):
 
 class AuthenticationError(EAMPError):
     """Authentication error"""
+    __slots__ = ()
     
     def __init__(self, message: str):
         super().__init__(message, code="AUTHENTICATION_ERROR")
@@ -57,6 +83,7 @@ class AuthenticationError(EAMPError):
 
 class AuthorizationError(EAMPError):
     """Authorization error"""
+    __slots__ = ()
     
     def __init__(self, message: str):
         super().__init__(message, code="AUTHORIZATION_ERROR")
@@ -64,6 +91,7 @@ class AuthorizationError(EAMPError):
 
 class RateLimitError(EAMPError):
     """Rate limit error"""
+    __slots__ = ('retry_after',)
     
     def __init__(self, message: str, retry_after: Optional[int] = None):
         super().__init__(message, code="RATE_LIMIT_ERROR")
@@ -72,6 +100,7 @@ class RateLimitError(EAMPError):
 
 class ServerError(EAMPError):
     """Server error"""
+    __slots__ = ('status_code',)
     
     def __init__(self, message: str, status_code: int):
         super().__init__(message, code="SERVER_ERROR")
@@ -80,6 +109,7 @@ class ServerError(EAMPError):
 
 class TimeoutError(EAMPError):
     """Timeout error"""
+    __slots__ = ('timeout',)
     
     def __init__(self, message: str, timeout: int):
         super().__init__(message, code="TIMEOUT_ERROR")
@@ -88,6 +118,7 @@ class TimeoutError(EAMPError):
 
 class ConfigurationError(EAMPError):
     """Configuration error"""
+    __slots__ = ()
     
     def __init__(self, message: str):
         super().__init__(message, code="CONFIGURATION_ERROR")
@@ -95,6 +126,7 @@ class ConfigurationError(EAMPError):
 
 class CacheError(EAMPError):
     """Cache operation error"""
+    __slots__ = ()
     
     def __init__(self, message: str):
         super().__init__(message, code="CACHE_ERROR")
@@ -102,6 +134,7 @@ class CacheError(EAMPError):
 
 class TransportError(EAMPError):
     """Transport layer error"""
+    __slots__ = ('transport_type',)
     
     def __init__(self, message: str, transport_type: str):
         super().__init__(message, code="TRANSPORT_ERROR")
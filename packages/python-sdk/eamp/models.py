@@ -2,10 +2,115 @@
 EAMP data models using Pydantic for validation and serialization.
 """
 
+import logging
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field, HttpUrl, validator, root_validator
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
+from typing_extensions import Annotated
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    StringConstraints,
+    field_validator,
+    validator,
+    root_validator,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _schema_examples() -> Dict[str, Dict[str, Any]]:
+    """Schema examples per model, built the first time a schema is generated"""
+    return {
+        "DataPoint": {
+            "label": "Q1 Sales",
+            "value": 1200000,
+            "unit": "USD",
+            "category": "quarterly"
+        },
+        "Scene": {
+            "time": "0:30-1:15",
+            "description": "Chef mixing ingredients in bowl",
+            "speakers": ["Chef Maria"],
+            "visual_elements": ["mixing bowl", "ingredients"],
+            "audio_elements": ["mixing sounds", "narration"]
+        },
+        "VisualElement": {
+            "type": "chart",
+            "description": "Blue bar chart showing sales data",
+            "position": "center",
+            "color": "blue",
+            "size": "large"
+        },
+        "Context": {
+            "page_title": "Q4 Financial Report",
+            "section_heading": "Sales Performance",
+            "purpose": "Illustrate quarterly sales growth"
+        },
+        "EAMPMetadata": {
+            "id": "sales-chart-2024",
+            "type": "image",
+            "short_alt": "Quarterly sales chart for 2024",
+            "extended_description": "Bar chart showing steady growth from Q1 to Q4...",
+            "data_points": [
+                {"label": "Q1", "value": 1200000, "unit": "USD"},
+                {"label": "Q2", "value": 1500000, "unit": "USD"}
+            ],
+            "accessibility_features": ["high-contrast", "screen-reader-optimized"],
+            "tags": ["finance", "sales", "2024"]
+        },
+        "EAMPError": {
+            "error": {
+                "code": "VALIDATION_ERROR",
+                "message": "shortAlt exceeds 250 characters",
+                "field": "short_alt"
+            }
+        },
+        "MetadataFilter": {
+            "type": "image",
+            "tags": ["finance", "charts"],
+            "accessibility_features": ["high-contrast"],
+            "has_data_points": True
+        },
+        "ClientOptions": {
+            "base_url": "https://api.example.com",
+            "timeout": 30,
+            "cache_enabled": True,
+            "headers": {"Authorization": "Bearer token"}
+        },
+        "ServerInfo": {
+            "name": "MyApp EAMP Server",
+            "version": "1.0.0",
+            "description": "Accessibility metadata server",
+            "capabilities": {
+                "real_time_updates": True,
+                "data_points": True
+            }
+        },
+    }
+
+
+def _schema_example(model_name: str) -> Callable[[Dict[str, Any]], None]:
+    """json_schema_extra hook that adds the model's example to its schema"""
+    def add_example(schema: Dict[str, Any]) -> None:
+        schema["example"] = _schema_examples()[model_name]
+    return add_example
+
+
+# Patterns shared with the msgspec mirrors in _fast_models
+EAMP_VERSION_PATTERN = r"^\d+\.\d+\.\d+$"
+SCENE_TIME_PATTERN = r"^\d{1,2}:\d{2}(:\d{2})?(-\d{1,2}:\d{2}(:\d{2})?)?$"
+
+# Constrained string types; pydantic-core compiles each pattern once per type
+ResourceId = Annotated[str, StringConstraints(min_length=1)]
+ShortAlt = Annotated[str, StringConstraints(min_length=1, max_length=250)]
+EAMPVersion = Annotated[str, StringConstraints(pattern=EAMP_VERSION_PATTERN)]
+SceneTime = Annotated[str, StringConstraints(pattern=SCENE_TIME_PATTERN)]
 
 
 class ContentType(str, Enum):
@@ -25,39 +130,18 @@ class DataPoint(BaseModel):
     category: Optional[str] = Field(None, description="Data category or group")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "label": "Q1 Sales",
-                "value": 1200000,
-                "unit": "USD",
-                "category": "quarterly"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example("DataPoint"))
 
 
 class Scene(BaseModel):
     """Scene description for video/audio content"""
-    time: str = Field(
-        ..., 
-        regex=r"^\d{1,2}:\d{2}(:\d{2})?(-\d{1,2}:\d{2}(:\d{2})?)?$",
-        description="Time range in MM:SS or HH:MM:SS format"
-    )
+    time: SceneTime = Field(..., description="Time range in MM:SS or HH:MM:SS format")
     description: str = Field(..., min_length=1, description="Scene description")
     speakers: Optional[List[str]] = Field(None, description="Active speakers")
     visual_elements: Optional[List[str]] = Field(None, description="Visual elements")
     audio_elements: Optional[List[str]] = Field(None, description="Audio elements")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "time": "0:30-1:15",
-                "description": "Chef mixing ingredients in bowl",
-                "speakers": ["Chef Maria"],
-                "visual_elements": ["mixing bowl", "ingredients"],
-                "audio_elements": ["mixing sounds", "narration"]
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example("Scene"))
 
 
 class VisualElementType(str, Enum):
@@ -89,16 +173,7 @@ class VisualElement(BaseModel):
     color: Optional[str] = Field(None, description="Primary color")
     size: Optional[ElementSize] = Field(None, description="Relative size")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "type": "chart",
-                "description": "Blue bar chart showing sales data",
-                "position": "center",
-                "color": "blue",
-                "size": "large"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example("VisualElement"))
 
 
 class Context(BaseModel):
@@ -110,27 +185,31 @@ class Context(BaseModel):
     user_task: Optional[str] = Field(None, description="Supported user task")
     related_elements: Optional[List[str]] = Field(None, description="Related element IDs")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "page_title": "Q4 Financial Report",
-                "section_heading": "Sales Performance",
-                "purpose": "Illustrate quarterly sales growth"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example("Context"))
+
+
+_VALID_ACCESSIBILITY_FEATURES = frozenset({
+    'high-contrast', 'screen-reader-optimized', 'keyboard-accessible',
+    'touch-friendly', 'voice-navigable', 'color-blind-friendly',
+    'motion-reduced', 'captions-available', 'audio-descriptions',
+    'sign-language'
+})
 
 
 class EAMPMetadata(BaseModel):
     """Core EAMP metadata model"""
-    id: str = Field(..., min_length=1, description="Unique resource identifier")
-    type: ContentType = Field(..., description="Content type")
-    eamp_version: str = Field("1.0.0", regex=r"^\d+\.\d+\.\d+$", description="EAMP version")
-    short_alt: str = Field(
-        ..., 
-        min_length=1, 
-        max_length=250,
-        description="Concise alternative text"
+    model_config = ConfigDict(
+        str_strip_whitespace=False,
+        extra='ignore',
+        validate_assignment=False,
+        revalidate_instances='never',
+        json_schema_extra=_schema_example("EAMPMetadata"),
     )
+
+    id: ResourceId = Field(..., description="Unique resource identifier")
+    type: ContentType = Field(..., description="Content type")
+    eamp_version: EAMPVersion = Field("1.0.0", description="EAMP version")
+    short_alt: ShortAlt = Field(..., description="Concise alternative text")
     extended_description: str = Field(
         ..., 
         min_length=1,
@@ -149,55 +228,35 @@ class EAMPMetadata(BaseModel):
     expires_at: Optional[datetime] = Field(None, description="Expiration timestamp")
     context: Optional[Context] = Field(None, description="Content context")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "id": "sales-chart-2024",
-                "type": "image",
-                "short_alt": "Quarterly sales chart for 2024",
-                "extended_description": "Bar chart showing steady growth from Q1 to Q4...",
-                "data_points": [
-                    {"label": "Q1", "value": 1200000, "unit": "USD"},
-                    {"label": "Q2", "value": 1500000, "unit": "USD"}
-                ],
-                "accessibility_features": ["high-contrast", "screen-reader-optimized"],
-                "tags": ["finance", "sales", "2024"]
-            }
-        }
-
-    @validator('accessibility_features', each_item=True)
-    def validate_accessibility_features(cls, feature):
+    @field_validator('accessibility_features')
+    @classmethod
+    def validate_accessibility_features(cls, features: Optional[List[str]]) -> Optional[List[str]]:
         """Validate accessibility features"""
-        valid_features = {
-            'high-contrast', 'screen-reader-optimized', 'keyboard-accessible',
-            'touch-friendly', 'voice-navigable', 'color-blind-friendly',
-            'motion-reduced', 'captions-available', 'audio-descriptions',
-            'sign-language'
-        }
-        if feature not in valid_features:
-            # Allow custom features but issue warning
-            pass
-        return feature
+        if features and not _VALID_ACCESSIBILITY_FEATURES.issuperset(features):
+            # Allow custom features but note them
+            logger.debug(
+                "Custom accessibility features: %s",
+                set(features) - _VALID_ACCESSIBILITY_FEATURES
+            )
+        return features
 
 
 class EAMPError(BaseModel):
     """EAMP error response"""
     error: Dict[str, Any] = Field(..., description="Error details")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "error": {
-                    "code": "VALIDATION_ERROR",
-                    "message": "shortAlt exceeds 250 characters",
-                    "field": "short_alt"
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example("EAMPError"))
 
 
 class MetadataFilter(BaseModel):
-    """Filter for querying metadata"""
+    """Filter for querying metadata
+    
+    Encode it for a request with ``utils.build_query_string`` (or
+    ``utils.build_query_params``), which map fields to the server's query
+    parameter names.
+    """
+    model_config = ConfigDict(json_schema_extra=_schema_example("MetadataFilter"))
+
     type: Optional[ContentType] = Field(None, description="Content type filter")
     tags: Optional[List[str]] = Field(None, description="Tag filters")
     accessibility_features: Optional[List[str]] = Field(None, description="Feature filters")
@@ -206,15 +265,8 @@ class MetadataFilter(BaseModel):
     has_data_points: Optional[bool] = Field(None, description="Has data points")
     language: Optional[str] = Field(None, description="Language code")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "type": "image",
-                "tags": ["finance", "charts"],
-                "accessibility_features": ["high-contrast"],
-                "has_data_points": True
-            }
-        }
+
+_VALID_CHANGE_TYPES = frozenset({'created', 'updated', 'deleted', 'data_updated'})
 
 
 class MetadataUpdate(BaseModel):
@@ -226,9 +278,8 @@ class MetadataUpdate(BaseModel):
 
     @validator('change_type')
     def validate_change_type(cls, change_type):
-        valid_types = {'created', 'updated', 'deleted', 'data_updated'}
-        if change_type not in valid_types:
-            raise ValueError(f'change_type must be one of {valid_types}')
+        if change_type not in _VALID_CHANGE_TYPES:
+            raise ValueError(f'change_type must be one of {set(_VALID_CHANGE_TYPES)}')
         return change_type
 
 
@@ -239,18 +290,30 @@ class ClientOptions(BaseModel):
     retry_attempts: int = Field(3, ge=0, description="Retry attempts")
     cache_enabled: bool = Field(True, description="Enable caching")
     cache_ttl: int = Field(300, gt=0, description="Cache TTL in seconds")
+    cache_track_stats: bool = Field(False, description="Track cache access counts for get_cache_stats()")
+    cache_clock_resolution: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Read cache time from a clock refreshed at this interval in seconds instead of per lookup"
+    )
+    trust_server: bool = Field(
+        False,
+        description="Skip validation of metadata fetched from the server (only timestamps and URLs are converted)"
+    )
+    fast_decode: bool = Field(
+        False,
+        description="Validate fetched metadata with msgspec instead of pydantic (requires msgspec)"
+    )
     user_agent: Optional[str] = Field(None, description="User agent string")
     headers: Optional[Dict[str, str]] = Field(None, description="Custom headers")
+    websocket_url: Optional[str] = Field(
+        None, description="WebSocket endpoint for real-time updates (e.g. wss://api.example.com/ws)"
+    )
+    http2: bool = Field(True, description="Use HTTP/2 when the h2 package is installed")
+    max_connections: int = Field(100, gt=0, description="Maximum concurrent connections")
+    max_keepalive_connections: int = Field(20, ge=0, description="Maximum idle keep-alive connections")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "base_url": "https://api.example.com",
-                "timeout": 30,
-                "cache_enabled": True,
-                "headers": {"Authorization": "Bearer token"}
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example("ClientOptions"))
 
 
 class ServerCapabilities(BaseModel):
@@ -268,15 +331,4 @@ class ServerInfo(BaseModel):
     description: Optional[str] = Field(None, description="Server description")
     capabilities: Optional[ServerCapabilities] = Field(None, description="Server capabilities")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "name": "MyApp EAMP Server",
-                "version": "1.0.0",
-                "description": "Accessibility metadata server",
-                "capabilities": {
-                    "real_time_updates": True,
-                    "data_points": True
-                }
-            }
-        }
\ No newline at end of file
+    model_config = ConfigDict(json_schema_extra=_schema_example("ServerInfo"))
@@ -2,144 +2,352 @@
 EAMP Python SDK utilities
 """
 
+import heapq
+import math
+import sys
 import time
-from typing import Any, Dict, Generic, Optional, TypeVar
-from threading import RLock
-from pydantic import ValidationError as PydanticValidationError
+from functools import lru_cache
+from typing import Any, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+from threading import Lock, Thread
+from urllib.parse import quote_plus
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
 
-from .models import EAMPMetadata, MetadataFilter
-from .exceptions import ValidationError
+from .models import ContentType, EAMPMetadata, MetadataFilter
+from .exceptions import ConfigurationError, ValidationError
 
 T = TypeVar('T')
 
+# Built once at import; validate_* reuse the compiled validators
+_METADATA_ADAPTER = TypeAdapter(EAMPMetadata)
+_FILTER_ADAPTER = TypeAdapter(MetadataFilter)
+
+# Field names checked by extract_multilingual_field instead of hasattr()
+_METADATA_FIELDS = frozenset(EAMPMetadata.model_fields)
+
+# Enum .value is a descriptor lookup; the query encoders read this table instead
+_CONTENT_TYPE_VALUES = {member: member.value for member in ContentType}
+
+# Descriptions are cached on the field values they are built from
+_DESCRIPTION_CACHE_SIZE = 1024
+
+
+class _CacheEntry:
+    """Cache entry; slotted so entries carry no per-instance dict"""
+    __slots__ = ('value', 'expires_at', 'created_at', 'last_accessed', 'access_count', 'size')
+
+    def __init__(self, value: Any, expires_at: float, now: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.created_at = now
+        self.last_accessed = now
+        self.access_count = 0
+        self.size = size
+
+
+try:
+    sys.getsizeof(0)
+except TypeError:  # PyPy does not implement sys.getsizeof()
+    def _getsizeof(obj: Any) -> int:
+        return 0
+else:
+    _getsizeof = sys.getsizeof
+
+_ENTRY_OVERHEAD = _getsizeof(_CacheEntry(None, 0.0, 0.0, 0))
+
+
+# Pooled entries kept per shard (16 shards -> up to 1024 entries by default)
+_ENTRY_POOL_SIZE = 64
+
+# Smallest expired batch at which purge_expired switches to purge_bulk
+_BULK_PURGE_MIN = 64
+
+
+class _CacheShard:
+    """One lock-protected slice of a MemoryCache"""
+    __slots__ = ('entries', 'expiry_heap', 'next_expiry', 'total_access_count', 'bytes', 'pool', 'lock')
+
+    def __init__(self):
+        self.entries: Dict[str, _CacheEntry] = {}
+        self.expiry_heap: List[Tuple[float, str]] = []
+        # Head of the expiry heap, so reads can skip purging with one compare
+        self.next_expiry = math.inf
+        # Running sum of access_count over live entries, so stats stay O(1)
+        self.total_access_count = 0
+        # Running size estimate of live entries, so stats need no traversal
+        self.bytes = 0
+        # Released entries are reused by set() instead of allocating new ones
+        self.pool: List[_CacheEntry] = []
+        self.lock = Lock()
+
+    def new_entry(self, value: Any, expires_at: float, now: float, size: int) -> _CacheEntry:
+        """Take an entry from the pool, or allocate one; caller holds the lock"""
+        self.bytes += size
+        if not self.pool:
+            return _CacheEntry(value, expires_at, now, size)
+        entry = self.pool.pop()
+        entry.value = value
+        entry.expires_at = expires_at
+        entry.created_at = now
+        entry.last_accessed = now
+        entry.access_count = 0
+        entry.size = size
+        return entry
+
+    def release(self, entry: _CacheEntry) -> None:
+        """Return a removed entry to the pool; caller holds the lock"""
+        self.total_access_count -= entry.access_count
+        self.bytes -= entry.size
+        if len(self.pool) < _ENTRY_POOL_SIZE:
+            entry.value = None  # don't keep the cached value alive
+            self.pool.append(entry)
+
+    def remove(self, key: str) -> bool:
+        """Remove an entry; caller holds the lock"""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.release(entry)
+        return True
+
+    def purge_expired(self, now: float) -> int:
+        """Pop expired entries off the head of the expiry heap; caller holds the lock"""
+        heap = self.expiry_heap
+        entries = self.entries
+        # Past this many one-by-one removals, a single rebuild pass is cheaper
+        bulk_after = max(len(entries) // 4, _BULK_PURGE_MIN)
+        removed_count = 0
+        while heap and heap[0][0] <= now:
+            if removed_count > bulk_after:
+                return removed_count + self.purge_bulk(now)
+            expires_at, key = heapq.heappop(heap)
+            entry = entries.get(key)
+            # Skip heap items left behind by a later set() or delete()
+            if entry is not None and entry.expires_at == expires_at:
+                del entries[key]
+                self.release(entry)
+                removed_count += 1
+        self.next_expiry = heap[0][0] if heap else math.inf
+        return removed_count
+
+    def purge_bulk(self, now: float) -> int:
+        """Drop all expired entries by rebuilding the shard; caller holds the lock"""
+        entries = self.entries
+        live = {key: entry for key, entry in entries.items() if entry.expires_at > now}
+        self.entries = live
+        self.total_access_count = sum(entry.access_count for entry in live.values())
+        self.bytes = sum(entry.size for entry in live.values())
+        self.rebuild_heap()
+        return len(entries) - len(live)
+
+    def rebuild_heap(self) -> None:
+        """Rebuild the expiry heap from live entries; caller holds the lock"""
+        self.expiry_heap = [
+            (entry.expires_at, key)
+            for key, entry in self.entries.items()
+            if entry.expires_at != math.inf
+        ]
+        heapq.heapify(self.expiry_heap)
+        self.next_expiry = self.expiry_heap[0][0] if self.expiry_heap else math.inf
+
+
+class _CoarseClock:
+    """Monotonic time refreshed by a daemon thread every ``resolution`` seconds"""
+    __slots__ = ('now', 'resolution')
+
+    def __init__(self, resolution: float):
+        self.resolution = resolution
+        self.now = time.monotonic()
+        Thread(target=self._tick, name="eamp-cache-clock", daemon=True).start()
+
+    def _tick(self) -> None:
+        while True:
+            time.sleep(self.resolution)
+            self.now = time.monotonic()
+
+
+# One shared ticker per resolution, however many caches use it
+_coarse_clocks: Dict[float, _CoarseClock] = {}
+_coarse_clocks_lock = Lock()
+
+
+def _coarse_clock(resolution: float) -> _CoarseClock:
+    """Shared coarse clock for a resolution, started on first use"""
+    with _coarse_clocks_lock:
+        clock = _coarse_clocks.get(resolution)
+        if clock is None:
+            clock = _coarse_clocks[resolution] = _CoarseClock(resolution)
+        return clock
+
 
 class MemoryCache(Generic[T]):
-    """Thread-safe in-memory cache with TTL support"""
+    """Thread-safe in-memory cache with TTL support
     
-    def __init__(self, ttl: int = 300):
+    Keys are spread over a power-of-two number of shards, each with its own
+    lock, so threads working on different keys rarely contend. All
+    timestamps use the monotonic clock. Expiry times are tracked in a
+    per-shard min-heap, so expired entries are dropped lazily from the head
+    of the heap on access instead of by scanning the whole cache. A TTL of
+    ``math.inf`` pins an entry until it is overwritten or deleted.
+    """
+    
+    def __init__(
+        self,
+        ttl: int = 300,
+        track_stats: bool = False,
+        shards: int = 16,
+        clock_resolution: Optional[float] = None,
+    ):
         """
         Initialize cache
         
         Args:
             ttl: Time-to-live in seconds (default 5 minutes)
+            track_stats: Record per-entry access counts on every get(); when
+                disabled, access-based stats are reported as None
+            shards: Number of independently locked shards (a power of two)
+            clock_resolution: If set, get() and set() read a clock refreshed
+                by a background thread at this interval (seconds) instead of
+                calling time.monotonic(); expiry may then lag by up to one
+                interval
         """
+        if shards < 1 or shards & (shards - 1):
+            raise ConfigurationError("shards must be a power of two")
+        if clock_resolution is not None and clock_resolution <= 0:
+            raise ConfigurationError("clock_resolution must be positive")
+        self._clock = _coarse_clock(clock_resolution) if clock_resolution else None
         self.ttl = ttl
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._lock = RLock()
+        self._track_stats = track_stats
+        self._shards = tuple(_CacheShard() for _ in range(shards))
+        self._shard_mask = shards - 1
     
     def get(self, key: str) -> Optional[T]:
         """Get value from cache"""
-        with self._lock:
-            entry = self._cache.get(key)
-            if not entry:
+        clock = self._clock
+        now = time.monotonic() if clock is None else clock.now
+        # Shard lookup is inlined in get/set/delete to save a call per operation
+        shard = self._shards[hash(key) & self._shard_mask]
+        with shard.lock:
+            if now >= shard.next_expiry:
+                shard.purge_expired(now)
+            entry = shard.entries.get(key)
+            if entry is None:
                 return None
             
-            if time.time() > entry['expires_at']:
-                del self._cache[key]
-                return None
-            
-            entry['access_count'] += 1
-            entry['last_accessed'] = time.time()
-            return entry['value']
+            if self._track_stats:
+                entry.access_count += 1
+                entry.last_accessed = now
+                shard.total_access_count += 1
+            return entry.value
     
-    def set(self, key: str, value: T, custom_ttl: Optional[int] = None) -> None:
+    def set(self, key: str, value: T, custom_ttl: Optional[float] = None) -> None:
         """Set value in cache"""
         ttl = custom_ttl if custom_ttl is not None else self.ttl
-        expires_at = time.time() + ttl
+        clock = self._clock
+        now = time.monotonic() if clock is None else clock.now
+        expires_at = now + ttl
+        shard = self._shards[hash(key) & self._shard_mask]
+        # Sized outside the lock; this is a shallow estimate of key and value
+        size = _getsizeof(key) + _getsizeof(value) + _ENTRY_OVERHEAD
         
-        with self._lock:
-            self._cache[key] = {
-                'value': value,
-                'expires_at': expires_at,
-                'created_at': time.time(),
-                'last_accessed': time.time(),
-                'access_count': 0,
-            }
+        with shard.lock:
+            if now >= shard.next_expiry:
+                shard.purge_expired(now)
+            shard.remove(key)
+            shard.entries[key] = shard.new_entry(value, expires_at, now, size)
+            if expires_at != math.inf:
+                heapq.heappush(shard.expiry_heap, (expires_at, key))
+                if expires_at < shard.next_expiry:
+                    shard.next_expiry = expires_at
+                # Overwritten keys leave stale heap items behind; rebuild the
+                # heap once they outnumber the live entries
+                if len(shard.expiry_heap) > 2 * len(shard.entries) + 64:
+                    shard.rebuild_heap()
     
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
-        with self._lock:
-            return self._cache.pop(key, None) is not None
+        shard = self._shards[hash(key) & self._shard_mask]
+        with shard.lock:
+            return shard.remove(key)
     
     def clear(self) -> None:
         """Clear all cached values"""
-        with self._lock:
-            self._cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry_heap.clear()
+                shard.next_expiry = math.inf
+                shard.total_access_count = 0
+                shard.bytes = 0
     
     def has(self, key: str) -> bool:
-        """Check if key exists and is not expired"""
-        return self.get(key) is not None
+        """Check if key exists and is not expired; does not count as an access"""
+        clock = self._clock
+        now = time.monotonic() if clock is None else clock.now
+        shard = self._shards[hash(key) & self._shard_mask]
+        with shard.lock:
+            entry = shard.entries.get(key)
+            return entry is not None and now < entry.expires_at
     
     def cleanup(self) -> int:
         """Remove expired entries and return count of removed items"""
-        current_time = time.time()
+        now = time.monotonic()
         removed_count = 0
-        
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if current_time > entry['expires_at']
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
-                removed_count += 1
-        
+        for shard in self._shards:
+            with shard.lock:
+                removed_count += shard.purge_expired(now)
         return removed_count
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        with self._lock:
-            current_time = time.time()
-            entries = list(self._cache.values())
-            
-            expired_count = sum(1 for entry in entries if current_time > entry['expires_at'])
-            active_count = len(entries) - expired_count
-            total_access_count = sum(entry['access_count'] for entry in entries)
-            
-            return {
-                'total_entries': len(self._cache),
-                'active_entries': active_count,
-                'expired_entries': expired_count,
-                'total_access_count': total_access_count,
-                'hit_rate': self._calculate_hit_rate(entries),
-                'memory_estimate': self._estimate_memory_usage(),
-            }
+        now = time.monotonic()
+        expired_count = 0
+        active_count = 0
+        total_access_count = 0
+        memory_estimate = 0
+        # Expired entries are only counted as they are purged here, so this
+        # touches expired entries instead of the whole cache
+        for shard in self._shards:
+            with shard.lock:
+                expired_count += shard.purge_expired(now)
+                active_count += len(shard.entries)
+                total_access_count += shard.total_access_count
+                memory_estimate += shard.bytes
+        
+        return {
+            'total_entries': active_count + expired_count,
+            'active_entries': active_count,
+            'expired_entries': expired_count,
+            'total_access_count': total_access_count if self._track_stats else None,
+            'hit_rate': (
+                self._calculate_hit_rate(total_access_count, active_count)
+                if self._track_stats else None
+            ),
+            'memory_estimate': memory_estimate,
+        }
     
-    def keys(self) -> List[str]:
-        """Get all keys in cache"""
-        with self._lock:
-            return list(self._cache.keys())
+    def keys(self) -> Tuple[str, ...]:
+        """Get a read-only snapshot of all keys in cache"""
+        keys: List[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                keys.extend(shard.entries)
+        return tuple(keys)
     
     def size(self) -> int:
         """Get cache size"""
-        with self._lock:
-            return len(self._cache)
+        # len() of a dict is an atomic read under the GIL, so no locking
+        return sum(len(shard.entries) for shard in self._shards)
     
-    def _calculate_hit_rate(self, entries: List[Dict[str, Any]]) -> float:
+    def __len__(self) -> int:
+        return self.size()
+    
+    def _calculate_hit_rate(self, total_accesses: int, unique_keys: int) -> float:
         """Calculate approximate hit rate"""
-        if not entries:
+        if not unique_keys:
             return 0.0
         
-        total_accesses = sum(entry['access_count'] for entry in entries)
-        unique_keys = len(entries)
-        
         # Rough estimation: assumes each key was requested at least once
-        return unique_keys / (total_accesses + unique_keys) if (total_accesses + unique_keys) > 0 else 0.0
-    
-    def _estimate_memory_usage(self) -> int:
-        """Estimate memory usage in bytes (rough calculation)"""
-        # This is a very rough estimation
-        import sys
-        total_size = 0
-        
-        with self._lock:
-            for key, entry in self._cache.items():
-                total_size += sys.getsizeof(key)
-                total_size += sys.getsizeof(entry['value'])
-                total_size += sys.getsizeof(entry)  # Dictionary overhead
-        
-        return total_size
+        return unique_keys / (total_accesses + unique_keys)
 
 
 def validate_metadata(data: Any) -> EAMPMetadata:
@@ -155,8 +363,11 @@ def validate_metadata(data: Any) -> EAMPMetadata:
     Raises:
         ValidationError: If data is invalid
     """
+    # Instances are never revalidated, so skip the pydantic-core call entirely
+    if isinstance(data, EAMPMetadata):
+        return data
     try:
-        return EAMPMetadata.parse_obj(data)
+        return _METADATA_ADAPTER.validate_python(data)
     except PydanticValidationError as e:
         raise ValidationError(f"Invalid metadata: {str(e)}")
 
@@ -174,8 +385,11 @@ def validate_filter(data: Any) -> MetadataFilter:
     Raises:
         ValidationError: If data is invalid
     """
+    # Instances are never revalidated, so skip the pydantic-core call entirely
+    if isinstance(data, MetadataFilter):
+        return data
     try:
-        return MetadataFilter.parse_obj(data)
+        return _FILTER_ADAPTER.validate_python(data)
     except PydanticValidationError as e:
         raise ValidationError(f"Invalid filter: {str(e)}")
 
@@ -191,27 +405,54 @@ def format_accessibility_description(metadata: EAMPMetadata, verbose: bool = Fal
     Returns:
         Formatted description string
     """
-    parts = [metadata.short_alt]
+    features = metadata.accessibility_features
+    features_key = tuple(features) if features else ()
+    if not verbose:
+        return _build_accessibility_description(
+            metadata.short_alt, None, (), 0, features_key
+        )
     
-    if verbose and metadata.extended_description:
-        parts.append(metadata.extended_description)
+    data_points = metadata.data_points or ()
+    # Only the first 5 points are described; the value type is part of the key
+    # so that True and 1 (equal as keys) keep their own text
+    points_key = tuple(
+        (point.label, type(point.value), point.value, point.unit)
+        for point in data_points[:5]
+    )
+    return _build_accessibility_description(
+        metadata.short_alt,
+        metadata.extended_description,
+        points_key,
+        len(data_points),
+        features_key,
+    )
+
+
+@lru_cache(maxsize=_DESCRIPTION_CACHE_SIZE)
+def _build_accessibility_description(
+    short_alt: str,
+    extended_description: Optional[str],
+    points: Tuple[Tuple[str, type, Any, Optional[str]], ...],
+    count: int,
+    features: Tuple[str, ...],
+) -> str:
+    """Build the description string for format_accessibility_description"""
+    parts = [short_alt]
     
-    if verbose and metadata.data_points:
-        data_summary = f"Contains {len(metadata.data_points)} data points: "
-        point_descriptions = []
-        for point in metadata.data_points[:5]:  # Limit to first 5 points
-            unit_str = f" {point.unit}" if point.unit else ""
-            point_descriptions.append(f"{point.label}: {point.value}{unit_str}")
-        
-        if len(metadata.data_points) > 5:
+    if extended_description:
+        parts.append(extended_description)
+    
+    if count:
+        point_descriptions = [
+            f"{label}: {value} {unit}" if unit else f"{label}: {value}"
+            for label, _, value, unit in points
+        ]
+        if count > 5:
             point_descriptions.append("and more")
-        
-        data_summary += ", ".join(point_descriptions)
-        parts.append(data_summary)
+        parts.append(f"Contains {count} data points: {', '.join(point_descriptions)}")
     
-    if metadata.accessibility_features:
-        features_str = f"Accessibility features: {', '.join(metadata.accessibility_features)}"
-        parts.append(features_str)
+    if features:
+        parts.append(f"Accessibility features: {', '.join(features)}")
     
     return ". ".join(parts) + "."
 
@@ -230,16 +471,52 @@ def extract_multilingual_field(metadata: EAMPMetadata, field_name: str, language
     """
     # Try language-specific field first
     lang_field = f"{field_name}_{language}"
-    if hasattr(metadata, lang_field):
+    if lang_field in _METADATA_FIELDS:
         return getattr(metadata, lang_field)
     
     # Fall back to base field
-    if hasattr(metadata, field_name):
+    if field_name in _METADATA_FIELDS:
         return getattr(metadata, field_name)
     
     return None
 
 
+def _join_list_values(values: List[str]) -> str:
+    """Comma-join filter values, percent-escaping commas and '%' inside values"""
+    joined = ",".join(values)
+    # Common case: no value contains a separator or escape character
+    if joined.count(",") == len(values) - 1 and "%" not in joined:
+        return joined
+    return ",".join(value.replace("%", "%25").replace(",", "%2C") for value in values)
+
+
+def _iter_query_fields(filter_obj: MetadataFilter) -> Iterator[Tuple[str, str]]:
+    """Yield (query parameter, unencoded value) pairs for the fields that are set"""
+    # Read each field once from the instance dict rather than via attributes
+    fields = filter_obj.__dict__
+    content_type = fields["type"]
+    if content_type:
+        yield "type", _CONTENT_TYPE_VALUES[content_type]
+    tags = fields["tags"]
+    if tags:
+        yield "tags", _join_list_values(tags)
+    features = fields["accessibility_features"]
+    if features:
+        yield "features", _join_list_values(features)
+    created_after = fields["created_after"]
+    if created_after:
+        yield "createdAfter", created_after.isoformat()
+    created_before = fields["created_before"]
+    if created_before:
+        yield "createdBefore", created_before.isoformat()
+    has_data_points = fields["has_data_points"]
+    if has_data_points is not None:
+        yield "hasDataPoints", "true" if has_data_points else "false"
+    language = fields["language"]
+    if language:
+        yield "language", language
+
+
 def build_query_params(filter_obj: MetadataFilter) -> Dict[str, str]:
     """
     Build query parameters from metadata filter
@@ -250,21 +527,22 @@ def build_query_params(filter_obj: MetadataFilter) -> Dict[str, str]:
     Returns:
         Dictionary of query parameters
     """
-    params = {}
+    return dict(_iter_query_fields(filter_obj))
+
+
+def build_query_string(filter_obj: MetadataFilter) -> str:
+    """
+    Build an encoded query string from metadata filter
     
-    if filter_obj.type:
-        params["type"] = filter_obj.type.value
-    if filter_obj.tags:
-        params["tags"] = ",".join(filter_obj.tags)
-    if filter_obj.accessibility_features:
-        params["features"] = ",".join(filter_obj.accessibility_features)
-    if filter_obj.created_after:
-        params["createdAfter"] = filter_obj.created_after.isoformat()
-    if filter_obj.created_before:
-        params["createdBefore"] = filter_obj.created_before.isoformat()
-    if filter_obj.has_data_points is not None:
-        params["hasDataPoints"] = str(filter_obj.has_data_points).lower()
-    if filter_obj.language:
-        params["language"] = filter_obj.language
+    Same parameters as build_query_params, encoded in a single pass so the
+    result can go straight into the request URL.
     
-    return params
\ No newline at end of file
+    Args:
+        filter_obj: Metadata filter object
+        
+    Returns:
+        URL-encoded query string, empty when no filter fields are set
+    """
+    return "&".join(
+        name + "=" + quote_plus(value) for name, value in _iter_query_fields(filter_obj)
+    )
@@ -0,0 +1,694 @@
+"""Unit tests for the EAMP client."""
+
+import asyncio
+import json
+import warnings
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+
+from eamp.client import EAMPClient
+from eamp.exceptions import (
+    RateLimitError,
+    ResourceNotFoundError,
+    ServerError,
+    TimeoutError,
+    ValidationError,
+)
+from eamp.models import (
+    ClientOptions,
+    ContentType,
+    EAMPMetadata,
+    MetadataFilter,
+    MetadataUpdate,
+)
+
+
+METADATA = {
+    "eamp_version": "1.0.0",
+    "id": "chart-1",
+    "type": "image",
+    "short_alt": "Quarterly sales chart",
+    "extended_description": "Bar chart of sales per quarter.",
+}
+
+
+def make_client(handler, **options):
+    """Create a client whose requests are answered by handler."""
+    client = EAMPClient(ClientOptions(base_url="https://api.example.com", **options))
+    client._http_client = httpx.AsyncClient(
+        base_url="https://api.example.com",
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+class TestClientCache:
+    """Test metadata caching in the client."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_populates_cache(self):
+        """Test a second fetch is served from the cache."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=METADATA)
+
+        client = make_client(handler)
+        first = await client.get_metadata("chart-1")
+        second = await client.get_metadata("chart-1")
+
+        assert len(requests) == 1
+        assert second is first
+        assert client.get_cache_stats()["active_entries"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self):
+        """Test every fetch hits the server when caching is off."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=METADATA)
+
+        client = make_client(handler, cache_enabled=False)
+        await client.get_metadata("chart-1")
+        await client.get_metadata("chart-1")
+
+        assert len(requests) == 2
+        assert client.get_cache_stats() is None
+        await client.close()
+
+    def test_update_populates_empty_cache(self):
+        """Test an update event caches metadata even when the cache is empty."""
+        client = EAMPClient(ClientOptions(base_url="https://api.example.com"))
+        update = MetadataUpdate(
+            resource_id="chart-1",
+            change_type="updated",
+            timestamp=datetime.now(timezone.utc),
+            metadata=EAMPMetadata(**METADATA),
+        )
+
+        client._handle_update("chart-1", update)
+        assert client._cache.get("chart-1") is update.metadata
+
+        deleted = MetadataUpdate(
+            resource_id="chart-1",
+            change_type="deleted",
+            timestamp=datetime.now(timezone.utc),
+        )
+        client._handle_update("chart-1", deleted)
+        assert client._cache.get("chart-1") is None
+
+
+def respond_with(*responses):
+    """Handler that returns (or raises) the given responses in order."""
+    pending = list(responses)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        response = pending.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    handler.requests = requests
+    return handler
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry delays instead of sleeping."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("eamp.client.asyncio.sleep", fake_sleep)
+    return delays
+
+
+class TestRetries:
+    """Test retrying transient failures."""
+
+    @pytest.mark.asyncio
+    async def test_retry_on_server_error(self, sleeps):
+        """Test 5xx responses are retried with exponential backoff."""
+        handler = respond_with(
+            httpx.Response(503),
+            httpx.Response(503),
+            httpx.Response(200, json=METADATA),
+        )
+        client = make_client(handler)
+
+        metadata = await client.get_metadata("chart-1")
+
+        assert metadata.id == "chart-1"
+        assert len(handler.requests) == 3
+        assert sleeps == [0.2, 0.4]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_server_error_after_last_attempt(self, sleeps):
+        """Test the final 5xx response is raised once attempts run out."""
+        handler = respond_with(*[httpx.Response(503)] * 3)
+        client = make_client(handler, retry_attempts=2)
+
+        with pytest.raises(ServerError):
+            await client.get_metadata("chart-1")
+
+        assert len(handler.requests) == 3
+        assert sleeps == [0.2, 0.4]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_after_on_rate_limit(self, sleeps):
+        """Test 429 responses wait for the Retry-After delay."""
+        handler = respond_with(
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json=METADATA),
+        )
+        client = make_client(handler)
+
+        await client.get_metadata("chart-1")
+
+        assert len(handler.requests) == 2
+        assert sleeps == [2]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_is_not_waited(self, sleeps):
+        """Test a Retry-After beyond the maximum delay is raised at once."""
+        handler = respond_with(httpx.Response(429, headers={"Retry-After": "3600"}))
+        client = make_client(handler)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await client.get_metadata("chart-1")
+
+        assert exc_info.value.retry_after == 3600
+        assert len(handler.requests) == 1
+        assert sleeps == []
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, sleeps):
+        """Test 4xx responses other than 429 are returned immediately."""
+        handler = respond_with(httpx.Response(404))
+        client = make_client(handler)
+
+        with pytest.raises(ResourceNotFoundError):
+            await client.get_metadata("chart-1")
+
+        assert len(handler.requests) == 1
+        assert sleeps == []
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_on_timeout(self, sleeps):
+        """Test timeouts are retried, and raised after the last attempt."""
+        handler = respond_with(
+            httpx.ConnectTimeout("timed out"),
+            httpx.Response(200, json=METADATA),
+        )
+        client = make_client(handler)
+        await client.get_metadata("chart-1")
+        assert len(handler.requests) == 2
+        await client.close()
+
+        handler = respond_with(httpx.ConnectTimeout("timed out"))
+        client = make_client(handler, retry_attempts=0)
+        with pytest.raises(TimeoutError):
+            await client.get_metadata("chart-1")
+        await client.close()
+
+
+class TestGetMany:
+    """Test fetching several resources concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_order_duplicates_and_cache(self):
+        """Test results follow input order and each resource is fetched once."""
+        requests = []
+
+        def handler(request):
+            resource_id = request.url.path.rsplit("/", 1)[-1]
+            requests.append(resource_id)
+            return httpx.Response(200, json=dict(METADATA, id=resource_id))
+
+        client = make_client(handler)
+        cached = await client.get_metadata("chart-2")
+
+        results = await client.get_many(["chart-3", "chart-2", "chart-1", "chart-3"])
+
+        assert [item.id for item in results] == [
+            "chart-3", "chart-2", "chart-1", "chart-3"
+        ]
+        assert results[1] is cached
+        assert results[0] is results[3]
+        assert sorted(requests) == ["chart-1", "chart-2", "chart-3"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test no more than concurrency requests are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            resource_id = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json=dict(METADATA, id=resource_id))
+
+        client = make_client(handler)
+        resource_ids = [f"chart-{i}" for i in range(10)]
+        results = await client.get_many(resource_ids, concurrency=3)
+
+        assert len(results) == 10
+        assert peak == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self):
+        """Test a concurrency below one is rejected."""
+        client = make_client(respond_with())
+        with pytest.raises(ValidationError):
+            await client.get_many(["chart-1"], concurrency=0)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_other_fetches(self):
+        """Test the first failure is raised and the remaining fetches stop."""
+        cancelled = []
+
+        async def handler(request):
+            resource_id = request.url.path.rsplit("/", 1)[-1]
+            if resource_id == "missing":
+                return httpx.Response(404)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(resource_id)
+                raise
+            return httpx.Response(200, json=dict(METADATA, id=resource_id))
+
+        client = make_client(handler)
+
+        with pytest.raises(ResourceNotFoundError):
+            await client.get_many(["chart-1", "missing", "chart-2"])
+
+        assert sorted(cancelled) == ["chart-1", "chart-2"]
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        assert all(task.done() for task in others)
+        await client.close()
+
+
+def listing(count):
+    """A JSON listing of count metadata records."""
+    return [dict(METADATA, id=f"chart-{i}") for i in range(count)]
+
+
+def chunked(body, size=7):
+    """Response content that arrives in small pieces."""
+    async def chunks():
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+    return chunks()
+
+
+@pytest.fixture(params=["ijson", "fallback"])
+def parser(request, monkeypatch):
+    """Run a test with the streaming parser and with the whole-body fallback."""
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr("eamp.client.ijson", None)
+    return request.param
+
+
+class TestListing:
+    """Test listing metadata."""
+
+    @pytest.mark.asyncio
+    async def test_list_metadata_sends_filter(self):
+        """Test list_metadata encodes the filter into the request URL."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=listing(3))
+
+        client = make_client(handler)
+        filter_obj = MetadataFilter(type=ContentType.IMAGE, tags=["finance"])
+        items = await client.list_metadata(filter_obj)
+
+        assert [item.id for item in items] == ["chart-0", "chart-1", "chart-2"]
+        assert requests[0].url.path == "/metadata"
+        assert dict(requests[0].url.params) == {"type": "image", "tags": "finance"}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_metadata_streams_items(self):
+        """Test iter_metadata parses a response that arrives in pieces."""
+        pytest.importorskip("ijson")
+        body = json.dumps(listing(5)).encode()
+        client = make_client(lambda request: httpx.Response(200, content=chunked(body)))
+
+        items = [item async for item in client.iter_metadata()]
+
+        assert [item.id for item in items] == [f"chart-{i}" for i in range(5)]
+        assert all(isinstance(item, EAMPMetadata) for item in items)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_metadata_without_ijson(self, monkeypatch):
+        """Test iter_metadata falls back to parsing the whole body."""
+        monkeypatch.setattr("eamp.client.ijson", None)
+        client = make_client(lambda request: httpx.Response(200, json=listing(2)))
+
+        items = [item async for item in client.iter_metadata()]
+
+        assert [item.id for item in items] == ["chart-0", "chart-1"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", [
+        b'{"error": "x"}',
+        b'  \n 42',
+        b'',
+        b'[{"id": "chart-1"',
+        b'[{"id": }]',
+    ], ids=["object", "number", "empty", "truncated", "malformed"])
+    async def test_iter_metadata_rejects_invalid_json(self, parser, body):
+        """Test bodies that aren't a JSON list are reported as invalid."""
+        client = make_client(lambda request: httpx.Response(200, content=chunked(body)))
+
+        with pytest.raises(ValidationError):
+            [item async for item in client.iter_metadata()]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_metadata_validates_items(self):
+        """Test invalid records are reported as validation errors."""
+        pytest.importorskip("ijson")
+        body = json.dumps([dict(METADATA, type="unknown")]).encode()
+        client = make_client(lambda request: httpx.Response(200, content=chunked(body)))
+
+        with pytest.raises(ValidationError):
+            [item async for item in client.iter_metadata()]
+        await client.close()
+
+
+class TestTrustedServer:
+    """Test building models without validation when trust_server is set."""
+
+    @pytest.mark.asyncio
+    async def test_trusted_fetch_builds_typed_model(self):
+        """Test trusted records convert nested models, enums, timestamps and URLs."""
+        record = dict(
+            METADATA,
+            created_at="2024-01-01T12:00:00Z",
+            metadata_uri="https://api.example.com/metadata/chart-1",
+            data_points=[{"label": "Q1", "value": 1}],
+        )
+        client = make_client(
+            lambda request: httpx.Response(200, json=record), trust_server=True
+        )
+
+        metadata = await client.get_metadata("chart-1")
+
+        assert metadata.type is ContentType.IMAGE
+        assert metadata.created_at == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        assert str(metadata.metadata_uri) == record["metadata_uri"]
+        assert metadata.data_points[0].label == "Q1"
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert metadata.model_dump_json()
+        await client.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", [
+        b"not json",
+        json.dumps({"id": "chart-1"}).encode(),
+        json.dumps(dict(METADATA, type="unknown")).encode(),
+        json.dumps([1]).encode(),
+        json.dumps(dict(METADATA, created_at="yesterday")).encode(),
+        json.dumps(dict(METADATA, metadata_uri="not a url")).encode(),
+    ], ids=["not-json", "missing-type", "unknown-type", "list", "bad-date", "bad-url"])
+    async def test_trusted_fetch_rejects_bad_data(self, body):
+        """Test malformed trusted records raise ValidationError."""
+        client = make_client(
+            lambda request: httpx.Response(200, content=body), trust_server=True
+        )
+
+        with pytest.raises(ValidationError):
+            await client.get_metadata("chart-1")
+        await client.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", [
+        b"not json",
+        json.dumps([{"id": "chart-1"}]).encode(),
+        json.dumps([1]).encode(),
+    ], ids=["not-json", "missing-type", "not-an-object"])
+    async def test_trusted_listing_rejects_bad_data(self, parser, body):
+        """Test malformed trusted listings raise ValidationError."""
+        client = make_client(
+            lambda request: httpx.Response(200, content=body), trust_server=True
+        )
+
+        with pytest.raises(ValidationError):
+            await client.list_metadata()
+        with pytest.raises(ValidationError):
+            [item async for item in client.iter_metadata()]
+        await client.close()
+
+
+class TestFastDecode:
+    """Test decoding fetched metadata with msgspec."""
+
+    @pytest.fixture(autouse=True)
+    def needs_msgspec(self):
+        pytest.importorskip("msgspec")
+
+    @pytest.mark.asyncio
+    async def test_fast_decode_builds_typed_model(self):
+        """Test a valid payload decodes to the same model pydantic builds."""
+        record = dict(
+            METADATA,
+            created_at="2024-01-01T12:00:00Z",
+            metadata_uri="https://api.example.com/metadata/chart-1",
+            data_points=[{"label": "Q1", "value": 1.5, "unit": "USD"}],
+            visual_elements=[{"type": "text", "description": "Title"}],
+        )
+        client = make_client(
+            lambda request: httpx.Response(200, json=record), fast_decode=True
+        )
+
+        metadata = await client.get_metadata("chart-1")
+
+        assert metadata == EAMPMetadata.model_validate(record)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            assert json.loads(metadata.model_dump_json()) == json.loads(
+                EAMPMetadata.model_validate(record).model_dump_json()
+            )
+        await client.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("record", [
+        {"id": "chart-1", "type": "image"},
+        dict(METADATA, short_alt="x" * 251),
+        dict(METADATA, type="unknown"),
+        dict(METADATA, eamp_version="one"),
+        dict(METADATA, metadata_uri="not a url"),
+        dict(METADATA, metadata_uri="ftp://example.com/chart-1"),
+    ], ids=[
+        "missing-fields", "long-alt", "unknown-type", "bad-version", "bad-url",
+        "ftp-url",
+    ])
+    async def test_fast_decode_rejects_invalid_payload(self, record):
+        """Test payloads pydantic would reject raise ValidationError."""
+        with pytest.raises(PydanticValidationError):
+            EAMPMetadata.model_validate(record)
+        client = make_client(
+            lambda request: httpx.Response(200, json=record), fast_decode=True
+        )
+
+        with pytest.raises(ValidationError):
+            await client.get_metadata("chart-1")
+        await client.close()
+
+
+class FakeWebSocket:
+    """Records sent frames and yields queued incoming frames until ended."""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(message)
+        await asyncio.sleep(0)
+
+    async def close(self):
+        self.closed = True
+
+    def end(self):
+        self.incoming.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+def update_frame(resource_id, change_type="updated", **metadata):
+    """A metadata_updated frame as sent by the server."""
+    frame = {
+        "type": "metadata_updated",
+        "resourceId": resource_id,
+        "changeType": change_type,
+        "timestamp": "2024-01-01T00:00:00Z",
+    }
+    if change_type != "deleted":
+        frame["metadata"] = dict(METADATA, id=resource_id, **metadata)
+    return json.dumps(frame)
+
+
+class TestSubscriptions:
+    """Test subscription bookkeeping."""
+
+    @pytest.mark.asyncio
+    async def test_subscribe_during_unsubscribe_all(self):
+        """Test subscribing while unsubscribe_all is sending messages."""
+        client = EAMPClient(ClientOptions(base_url="https://api.example.com"))
+        await client.subscribe("chart-1", lambda update: None)
+        await client.subscribe("chart-2", lambda update: None)
+        client._ws = FakeWebSocket()
+
+        await asyncio.gather(
+            client.unsubscribe_all(),
+            client.subscribe("chart-3", lambda update: None),
+        )
+
+        assert len(client._ws.sent) == 2
+        assert client.get_subscriptions() == ("chart-3",)
+
+    @pytest.mark.asyncio
+    async def test_updates_are_dispatched_in_order(self, monkeypatch):
+        """Test frames from the stream reach callbacks in arrival order."""
+        ws = FakeWebSocket()
+
+        async def connect(url):
+            return ws
+
+        monkeypatch.setattr("eamp.client.websockets.connect", connect)
+        client = EAMPClient(ClientOptions(
+            base_url="https://api.example.com",
+            websocket_url="wss://api.example.com/ws",
+        ))
+        received = []
+        await client.subscribe("chart-1", received.append)
+
+        assert json.loads(ws.sent[0]) == {"type": "subscribe", "resourceId": "chart-1"}
+
+        ws.incoming.put_nowait(update_frame("chart-1", short_alt="First"))
+        ws.incoming.put_nowait("not json")
+        ws.incoming.put_nowait(json.dumps({"type": "error", "message": "ignored"}))
+        ws.incoming.put_nowait(update_frame("chart-1", short_alt="Second"))
+        ws.incoming.put_nowait(update_frame("chart-2", short_alt="Unsubscribed"))
+        ws.end()
+        await client._ws_consumer
+
+        assert [update.metadata.short_alt for update in received] == ["First", "Second"]
+        assert client._ws is None
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_deleted_update_invalidates_cache(self, monkeypatch):
+        """Test a deleted frame removes the pinned cache entry."""
+        ws = FakeWebSocket()
+
+        async def connect(url):
+            return ws
+
+        monkeypatch.setattr("eamp.client.websockets.connect", connect)
+        client = EAMPClient(ClientOptions(
+            base_url="https://api.example.com",
+            websocket_url="wss://api.example.com/ws",
+        ))
+        received = []
+        await client.subscribe("chart-1", received.append)
+
+        ws.incoming.put_nowait(update_frame("chart-1"))
+        ws.incoming.put_nowait(update_frame("chart-1", change_type="deleted"))
+        ws.end()
+        await client._ws_consumer
+
+        assert [update.change_type for update in received] == ["updated", "deleted"]
+        assert client._cache.get("chart-1") is None
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_dropped_stream_evicts_pinned_entries(self, monkeypatch):
+        """Test entries kept fresh by the stream are dropped when it ends."""
+        ws = FakeWebSocket()
+
+        async def connect(url):
+            return ws
+
+        monkeypatch.setattr("eamp.client.websockets.connect", connect)
+        handler = respond_with(
+            httpx.Response(200, json=dict(METADATA, short_alt="From server"))
+        )
+        client = make_client(handler, websocket_url="wss://api.example.com/ws")
+        updated = asyncio.Event()
+        await client.subscribe("chart-1", lambda update: updated.set())
+
+        ws.incoming.put_nowait(update_frame("chart-1", short_alt="From stream"))
+        await updated.wait()
+        assert (await client.get_metadata("chart-1")).short_alt == "From stream"
+
+        ws.end()
+        await client._ws_consumer
+
+        assert client._cache.get("chart-1") is None
+        assert (await client.get_metadata("chart-1")).short_alt == "From server"
+        assert len(handler.requests) == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_stream_tasks(self, monkeypatch):
+        """Test close() cancels the reader and consumer and closes the socket."""
+        ws = FakeWebSocket()
+
+        async def connect(url):
+            return ws
+
+        monkeypatch.setattr("eamp.client.websockets.connect", connect)
+        client = EAMPClient(ClientOptions(
+            base_url="https://api.example.com",
+            websocket_url="wss://api.example.com/ws",
+        ))
+        await client.subscribe("chart-1", lambda update: None)
+        reader, consumer = client._ws_reader, client._ws_consumer
+
+        await client.close()
+
+        assert ws.closed
+        assert reader.done() and consumer.done()
+        assert client._ws is None
@@ -0,0 +1,63 @@
+"""Unit tests for EAMP exceptions."""
+
+import copy
+import pickle
+
+import pytest
+
+from eamp.exceptions import (
+    AuthenticationError,
+    EAMPError,
+    RateLimitError,
+    ServerError,
+    TimeoutError,
+    TransportError,
+    ValidationError,
+)
+
+
+ERRORS = [
+    EAMPError("bad", code="X", field="f", details={"key": "value"}),
+    ValidationError("bad field", field="short_alt", details={"max": 250}),
+    AuthenticationError("no key"),
+    RateLimitError("slow down", retry_after=5),
+    ServerError("boom", status_code=503),
+    TimeoutError("too slow", timeout=30),
+    TransportError("closed", transport_type="websocket"),
+]
+
+ATTRIBUTES = (
+    "code", "field", "details", "retry_after", "status_code", "timeout",
+    "transport_type",
+)
+
+
+def assert_same_error(restored, original):
+    """Check a restored error matches the original."""
+    assert type(restored) is type(original)
+    assert restored.args == original.args
+    assert str(restored) == str(original)
+    for name in ATTRIBUTES:
+        assert getattr(restored, name, None) == getattr(original, name, None)
+
+
+class TestErrorRoundTrip:
+    """Test errors keep their attributes when copied or pickled."""
+
+    @pytest.mark.parametrize("error", ERRORS, ids=lambda e: type(e).__name__)
+    def test_copy(self, error):
+        """Test shallow and deep copies."""
+        assert_same_error(copy.copy(error), error)
+        assert_same_error(copy.deepcopy(error), error)
+
+    @pytest.mark.parametrize("error", ERRORS, ids=lambda e: type(e).__name__)
+    def test_pickle(self, error):
+        """Test pickling keeps every attribute."""
+        assert_same_error(pickle.loads(pickle.dumps(error)), error)
+
+    def test_extra_attributes(self):
+        """Test attributes set outside __init__ survive a round trip."""
+        error = RateLimitError("slow down", retry_after=5)
+        error.request_id = "abc"
+
+        assert pickle.loads(pickle.dumps(error)).request_id == "abc"
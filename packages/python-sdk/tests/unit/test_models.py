@@ -28,15 +28,15 @@ class TestDataPoint:
         assert data_point.unit == "USD"
 
     def test_data_point_with_string_value(self):
-        """Test data point with string value that can be converted."""
+        """Test string values are kept as strings (the schema allows both)."""
         data_point = DataPoint(
             label="Temperature",
             value="25.5",
             unit="Celsius"
         )
         
-        assert data_point.value == 25.5
-        assert isinstance(data_point.value, (int, float))
+        assert data_point.value == "25.5"
+        assert isinstance(data_point.value, str)
 
     def test_data_point_validation_error(self):
         """Test data point validation errors."""
@@ -208,7 +208,8 @@ class TestEAMPMetadata:
             id="test-resource",
             type=ContentType.IMAGE,
             eamp_version="1.0.0",
-            short_alt="Test image"
+            short_alt="Test image",
+            extended_description="A test image."
         )
         
         assert metadata.id == "test-resource"
@@ -260,10 +261,11 @@ class TestEAMPMetadata:
                 id="test-resource",
                 type=ContentType.IMAGE,
                 eamp_version="1.0.0",
-                short_alt="A" * 130  # Exceeds 125 character limit
+                short_alt="A" * 251,  # Exceeds 250 character limit
+                extended_description="A test image."
             )
         
-        assert "String should have at most 125 characters" in str(exc_info.value)
+        assert "String should have at most 250 characters" in str(exc_info.value)
 
     def test_metadata_serialization(self):
         """Test metadata serialization to dict."""
@@ -272,6 +274,7 @@ class TestEAMPMetadata:
             type=ContentType.IMAGE,
             eamp_version="1.0.0",
             short_alt="Test image",
+            extended_description="A test image.",
             tags=["test", "sample"]
         )
         
@@ -288,6 +291,7 @@ class TestEAMPMetadata:
             type=ContentType.IMAGE,
             eamp_version="1.0.0",
             short_alt="Test image",
+            extended_description="A test image.",
             data_points=[
                 DataPoint(label="Value", value=100, unit="count")
             ]
@@ -305,6 +309,7 @@ class TestEAMPMetadata:
             "type": "image",
             "eamp_version": "1.0.0",
             "short_alt": "Test image",
+            "extended_description": "A test image.",
             "tags": ["test"]
         }
         
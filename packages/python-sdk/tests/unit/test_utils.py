@@ -0,0 +1,360 @@
+"""Unit tests for EAMP utilities."""
+
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from eamp import utils
+from eamp.exceptions import ConfigurationError
+from eamp.models import ContentType, DataPoint, EAMPMetadata, MetadataFilter
+from eamp.utils import (
+    MemoryCache,
+    build_query_params,
+    build_query_string,
+    format_accessibility_description,
+)
+
+
+class FakeTime:
+    """Stand-in for the time module with a manually advanced clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive MemoryCache time by hand."""
+    fake = FakeTime()
+    monkeypatch.setattr(utils, "time", fake)
+    return fake
+
+
+class TestMemoryCache:
+    """Test MemoryCache."""
+
+    def test_set_and_get(self, clock):
+        """Test storing and reading values."""
+        cache = MemoryCache(ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") == 2
+        assert cache.get("missing") is None
+        assert cache.size() == len(cache) == 2
+        assert sorted(cache.keys()) == ["a", "b"]
+
+    def test_overwrite(self, clock):
+        """Test overwriting a key replaces its value and TTL."""
+        cache = MemoryCache(ttl=60)
+        cache.set("a", 1, custom_ttl=10)
+        cache.set("a", 2)
+        clock.advance(30)
+
+        assert cache.get("a") == 2
+        assert cache.size() == 1
+
+    def test_expiry(self, clock):
+        """Test entries expire after their TTL."""
+        cache = MemoryCache(ttl=60)
+        cache.set("short", 1, custom_ttl=5)
+        cache.set("long", 2)
+
+        clock.advance(4.9)
+        assert cache.get("short") == 1
+
+        clock.advance(0.1)
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        assert cache.size() == 1
+
+    def test_infinite_ttl(self, clock):
+        """Test a TTL of math.inf pins an entry."""
+        cache = MemoryCache(ttl=60)
+        cache.set("pinned", 1, custom_ttl=math.inf)
+        clock.advance(10 ** 9)
+
+        assert cache.get("pinned") == 1
+
+    def test_delete_and_clear(self, clock):
+        """Test deleting single keys and clearing the cache."""
+        cache = MemoryCache(ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        assert cache.delete("a") is True
+        assert cache.delete("a") is False
+        assert cache.get("a") is None
+
+        cache.clear()
+        assert cache.size() == 0
+        assert cache.get("b") is None
+
+    def test_empty_cache_is_usable(self, clock):
+        """Test an empty cache can be filled (len() of 0 must not disable it)."""
+        cache = MemoryCache(ttl=60)
+        assert len(cache) == 0
+        cache.set("a", 1)
+        assert len(cache) == 1
+
+    def test_has(self, clock):
+        """Test membership checks honour expiry and don't count as access."""
+        cache = MemoryCache(ttl=60, track_stats=True)
+        cache.set("a", 1, custom_ttl=5)
+        cache.set("none", None)
+
+        assert cache.has("a")
+        assert cache.has("none")
+        assert not cache.has("missing")
+        assert cache.get_stats()["total_access_count"] == 0
+
+        clock.advance(5)
+        assert not cache.has("a")
+
+    def test_cleanup(self, clock):
+        """Test cleanup removes expired entries and reports how many."""
+        cache = MemoryCache(ttl=60)
+        for i in range(10):
+            cache.set(f"short-{i}", i, custom_ttl=5)
+        cache.set("long", 1)
+        clock.advance(10)
+
+        assert cache.cleanup() == 10
+        assert cache.keys() == ("long",)
+
+    def test_bulk_purge(self, clock):
+        """Test purging when most of a shard has expired."""
+        cache = MemoryCache(ttl=60, shards=1, track_stats=True)
+        for i in range(1000):
+            cache.set(str(i), i, custom_ttl=5 if i % 10 else 60)
+        for i in range(0, 1000, 10):
+            cache.get(str(i))
+        clock.advance(10)
+
+        assert cache.cleanup() == 900
+        stats = cache.get_stats()
+        assert stats["active_entries"] == 100
+        assert stats["total_access_count"] == 100
+        assert all(cache.get(str(i)) == i for i in range(0, 1000, 10))
+
+    def test_stats(self, clock):
+        """Test statistics with access tracking enabled."""
+        cache = MemoryCache(ttl=60, track_stats=True)
+        cache.set("a", 1)
+        cache.set("b", 2, custom_ttl=5)
+        cache.get("a")
+        cache.get("a")
+        clock.advance(10)
+
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 2
+        assert stats["active_entries"] == 1
+        assert stats["expired_entries"] == 1
+        assert stats["total_access_count"] == 2
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+    def test_stats_without_tracking(self, clock):
+        """Test access stats are None when tracking is disabled."""
+        cache = MemoryCache(ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+
+        stats = cache.get_stats()
+        assert stats["active_entries"] == 1
+        assert stats["total_access_count"] is None
+        assert stats["hit_rate"] is None
+
+    def test_memory_estimate(self, clock):
+        """Test the running memory estimate follows sets and deletes."""
+        cache = MemoryCache(ttl=60)
+        cache.set("a", "x" * 100)
+        cache.set("b", "y")
+        cache.set("a", "z")
+        cache.delete("b")
+
+        expected = sys.getsizeof("a") + sys.getsizeof("z") + utils._ENTRY_OVERHEAD
+        assert cache.get_stats()["memory_estimate"] == expected
+
+        cache.clear()
+        assert cache.get_stats()["memory_estimate"] == 0
+
+    def test_pool_reuse(self, clock):
+        """Test removed entries are recycled without keeping old values."""
+        cache = MemoryCache(ttl=60, shards=1)
+        shard = cache._shards[0]
+        cache.set("a", "old")
+        entry = shard.entries["a"]
+
+        cache.delete("a")
+        assert shard.pool == [entry]
+        assert entry.value is None
+
+        cache.set("b", "new")
+        assert shard.entries["b"] is entry
+        assert entry.value == "new"
+        assert entry.access_count == 0
+        assert shard.pool == []
+
+    def test_pool_is_bounded(self, clock):
+        """Test the entry pool never grows past its limit."""
+        cache = MemoryCache(ttl=60, shards=1)
+        for i in range(utils._ENTRY_POOL_SIZE * 2):
+            cache.set(str(i), i)
+        for i in range(utils._ENTRY_POOL_SIZE * 2):
+            cache.delete(str(i))
+
+        assert len(cache._shards[0].pool) == utils._ENTRY_POOL_SIZE
+
+    def test_keys_spread_over_shards(self, clock):
+        """Test keys are distributed over shards and all remain reachable."""
+        cache = MemoryCache(ttl=60, shards=4)
+        for i in range(100):
+            cache.set(f"key-{i}", i)
+
+        assert sum(1 for shard in cache._shards if shard.entries) > 1
+        assert all(cache.get(f"key-{i}") == i for i in range(100))
+
+    def test_shards_must_be_power_of_two(self):
+        """Test invalid shard counts are rejected."""
+        with pytest.raises(ConfigurationError):
+            MemoryCache(shards=3)
+        with pytest.raises(ConfigurationError):
+            MemoryCache(shards=0)
+
+
+class TestQueryEncoding:
+    """Test encoding metadata filters as query parameters."""
+
+    def test_empty_filter(self):
+        """Test a filter with no fields set encodes to nothing."""
+        assert build_query_params(MetadataFilter()) == {}
+        assert build_query_string(MetadataFilter()) == ""
+
+    def test_all_fields(self):
+        """Test every filter field maps to its query parameter."""
+        filter_obj = MetadataFilter(
+            type=ContentType.IMAGE,
+            tags=["finance", "charts"],
+            accessibility_features=["alt-text"],
+            created_after=datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=2))),
+            created_before=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            has_data_points=False,
+            language="en",
+        )
+
+        assert build_query_params(filter_obj) == {
+            "type": "image",
+            "tags": "finance,charts",
+            "features": "alt-text",
+            "createdAfter": "2024-01-01T00:00:00+02:00",
+            "createdBefore": "2024-02-01T00:00:00+00:00",
+            "hasDataPoints": "false",
+            "language": "en",
+        }
+        assert build_query_string(filter_obj) == (
+            "type=image"
+            "&tags=finance%2Ccharts"
+            "&features=alt-text"
+            "&createdAfter=2024-01-01T00%3A00%3A00%2B02%3A00"
+            "&createdBefore=2024-02-01T00%3A00%3A00%2B00%3A00"
+            "&hasDataPoints=false"
+            "&language=en"
+        )
+
+    def test_every_content_type(self):
+        """Test each content type encodes to its value."""
+        for content_type in ContentType:
+            filter_obj = MetadataFilter(type=content_type)
+            assert build_query_params(filter_obj) == {"type": content_type.value}
+            assert build_query_string(filter_obj) == f"type={content_type.value}"
+
+    def test_empty_lists_are_ignored(self):
+        """Test empty tag and feature lists are not sent."""
+        filter_obj = MetadataFilter(tags=[], accessibility_features=[])
+        assert filter_obj.tags == []
+        assert build_query_params(filter_obj) == {}
+        assert build_query_string(filter_obj) == ""
+
+    def test_commas_inside_values_are_escaped(self):
+        """Test list values containing separators stay unambiguous."""
+        filter_obj = MetadataFilter(tags=["a,b", "50%", "c d"])
+
+        assert build_query_params(filter_obj) == {"tags": "a%2Cb,50%25,c d"}
+        assert build_query_string(filter_obj) == "tags=a%252Cb%2C50%2525%2Cc+d"
+
+    def test_matches_httpx_encoding(self):
+        """Test the query string decodes to the same parameters."""
+        httpx = pytest.importorskip("httpx")
+        filter_obj = MetadataFilter(
+            type=ContentType.VIDEO,
+            tags=["a b", "ü"],
+            has_data_points=True,
+        )
+
+        query = build_query_string(filter_obj)
+        url = httpx.URL("https://api.example.com/metadata?" + query)
+        assert dict(url.params) == build_query_params(filter_obj)
+
+
+class TestAccessibilityDescription:
+    """Test format_accessibility_description."""
+
+    @staticmethod
+    def make_metadata(**fields):
+        return EAMPMetadata(
+            id="chart-1",
+            type=ContentType.IMAGE,
+            short_alt=fields.pop("short_alt", "Sales chart"),
+            extended_description="Quarterly sales.",
+            **fields,
+        )
+
+    def test_short(self):
+        """Test the non-verbose description."""
+        metadata = self.make_metadata(accessibility_features=["alt-text"])
+
+        assert format_accessibility_description(metadata) == (
+            "Sales chart. Accessibility features: alt-text."
+        )
+
+    def test_verbose(self):
+        """Test the verbose description lists at most five data points."""
+        metadata = self.make_metadata(
+            data_points=[
+                DataPoint(label=f"Q{i}", value=i, unit="USD" if i == 1 else None)
+                for i in range(1, 7)
+            ]
+        )
+
+        assert format_accessibility_description(metadata, verbose=True) == (
+            "Sales chart. Quarterly sales.. Contains 6 data points: "
+            "Q1: 1 USD, Q2: 2, Q3: 3, Q4: 4, Q5: 5, and more."
+        )
+
+    def test_follows_changes(self):
+        """Test the description reflects fields changed after a first call."""
+        metadata = self.make_metadata(
+            data_points=[DataPoint(label="Q1", value=1)]
+        )
+        assert format_accessibility_description(metadata) == "Sales chart."
+
+        metadata.short_alt = "Revenue chart"
+        metadata.accessibility_features = ["sonification"]
+        assert format_accessibility_description(metadata) == (
+            "Revenue chart. Accessibility features: sonification."
+        )
+
+        metadata.data_points[0].value = True
+        assert format_accessibility_description(metadata, verbose=True) == (
+            "Revenue chart. Quarterly sales.. Contains 1 data points: Q1: True. "
+            "Accessibility features: sonification."
+        )